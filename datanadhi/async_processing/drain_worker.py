@@ -1,53 +1,55 @@
 """Drain worker to handle queue overflow."""
 
 import threading
-import time
 
 from datanadhi.utils.files import store_dropped_data
 
 
 class DrainWorker:
-    """Emergency worker to drain queue to fallback at 90% capacity."""
+    """Emergency worker to drain queue to fallback at 90% capacity.
+
+    send_fn(session, items=...) must already be bound to the fallback host
+    and API key.
+    """
 
     def __init__(
         self,
         queue,
         fallback_server_host: str,
-        api_key: str,
         send_fn,
         health_check_fn,
+        health_monitor,
         logger,
         datanadhi_dir,
+        session,
     ):
         """Initialize drain worker with queue and fallback config."""
         self.queue = queue
         self.fallback_server_host = fallback_server_host
-        self.api_key = api_key
         self.send_fn = send_fn
         self.health_check_fn = health_check_fn
+        self.health_monitor = health_monitor
         self.logger = logger
         self.datanadhi_dir = datanadhi_dir
+        self.session = session
 
         self._worker_thread = None
-        self._lock = threading.Lock()
-        self._is_running = False
+        self._lock = threading.Lock()  # only taken to start the worker
+        self._drain_active = threading.Event()
 
     def start_if_needed(self):
         """Start drain worker if queue ≥90% and not already running."""
-        fill_pct = self.queue.fill_percentage()
+        if self._drain_active.is_set():
+            return False
 
-        if fill_pct >= 0.90:
+        if self.queue.fill_percentage() >= 0.90:
             with self._lock:
-                # Check if already running
-                if (
-                    self._is_running
-                    and self._worker_thread
-                    and self._worker_thread.is_alive()
-                ):
+                # Another submitter may have started it meanwhile
+                if self._drain_active.is_set():
                     return False
 
                 # Start new worker
-                self._is_running = True
+                self._drain_active.set()
                 self._worker_thread = threading.Thread(
                     target=self._drain_loop, daemon=True, name="datanadhi-drain-worker"
                 )
@@ -58,21 +60,23 @@ class DrainWorker:
 
     def _drain_loop(self):
         """Drain queue in batches until it reaches 10% capacity."""
-        import requests
+        session = self.session
 
-        session = requests.Session()
+        if self.logger.debug_enabled:
+            self.logger.debug(
+                "Drain worker started",
+                context={"queue_fill": f"{self.queue.fill_percentage():.0%}"},
+                trace_id="datanadhi-drain-worker",
+                _datanadhi_internal=True,
+            )
 
-        self.logger.debug(
-            "Drain worker started",
-            context={"queue_fill": f"{self.queue.fill_percentage():.0%}"},
-            trace_id="datanadhi-drain-worker",
-            _datanadhi_internal=True,
-        )
+        # Drain until 10% capacity; qsize() is an O(1) read per batch
+        stop_size = int(self.queue.maxsize * 0.10)
 
         try:
-            while self.queue.fill_percentage() > 0.10:
+            while self.queue.qsize() > stop_size:
                 # Wait for fallback server to be healthy
-                if not self._wait_for_healthy_server(session):
+                if not self._wait_for_healthy_server():
                     # Could not reach server, stop draining
                     self.logger.error(
                         "Drain worker stopped, fallback unreachable",
@@ -87,55 +91,11 @@ class DrainWorker:
                 if not items:
                     break
 
-                # Convert to payload format
-                payloads = [
-                    {"pipelines": item[0], "log_data": item[1]} for item in items
-                ]
-
-                # Send batch to fallback server
-                result = self.send_fn(
-                    session, self.fallback_server_host, payloads, self.api_key
-                )
-
-                if result["success"]:
-                    # Mark as done
-                    for _ in items:
-                        self.queue.task_done()
-                    self.logger.debug(
-                        "Drain worker sent batch",
-                        context={"batch_size": len(items)},
-                        trace_id="datanadhi-drain-worker",
-                        _datanadhi_internal=True,
-                    )
-
-                elif result["is_unavailable"]:
-                    # Fallback server down, write back and wait
-                    self.queue.writeback_batch(items)
-                    self.logger.warning(
-                        "Drain worker: fallback unavailable, retrying",
-                        context={"server": self.fallback_server_host},
-                        trace_id="datanadhi-drain-worker",
-                        _datanadhi_internal=True,
-                    )
-                    time.sleep(0.1)
-
-                else:
-                    # Other error, mark as done (drop items)
-                    file_path = store_dropped_data(
-                        self.datanadhi_dir, items, "drain_worker_failed"
-                    )
-                    for _ in items:
-                        self.queue.task_done()
-                    self.logger.error(
-                        "Drain worker batch failed, data dropped",
-                        context={
-                            "status_code": result.get("status_code"),
-                            "batch_size": len(items),
-                            "file": file_path,
-                        },
-                        trace_id="datanadhi-drain-worker",
-                        _datanadhi_internal=True,
-                    )
+                try:
+                    self._send_batch(session, items)
+                except Exception as e:
+                    # Settle the batch so queue.join() is not left waiting on it
+                    self._drop_batch(items, "drain_worker_error", {"error": str(e)})
 
         except Exception as e:
             self.logger.error(
@@ -145,27 +105,69 @@ class DrainWorker:
                 _datanadhi_internal=True,
             )
         finally:
-            session.close()
-            with self._lock:
-                self._is_running = False
-            self.logger.debug(
-                "Drain worker stopped",
-                context={"queue_fill": f"{self.queue.fill_percentage():.0%}"},
+            self._drain_active.clear()
+            if self.logger.debug_enabled:
+                self.logger.debug(
+                    "Drain worker stopped",
+                    context={"queue_fill": f"{self.queue.fill_percentage():.0%}"},
+                    trace_id="datanadhi-drain-worker",
+                    _datanadhi_internal=True,
+                )
+
+    def _send_batch(self, session, items: list[tuple]):
+        """Send one batch to fallback, then settle it by the result."""
+        result = self.send_fn(session, items=items)
+
+        if result["success"]:
+            # Mark as done
+            self.queue.task_done_n(len(items))
+            if self.logger.debug_enabled:
+                self.logger.debug(
+                    "Drain worker sent batch",
+                    context={"batch_size": len(items)},
+                    trace_id="datanadhi-drain-worker",
+                    _datanadhi_internal=True,
+                )
+
+        elif result["is_unavailable"]:
+            # Fallback server down, write back and wait for recovery
+            self.queue.writeback_many(items)
+            self.health_monitor.set_health_down(
+                self.fallback_server_host,
+                is_fallback=True,
+                health_check_fn=self.health_check_fn,
+            )
+            self.logger.warning(
+                "Drain worker: fallback unavailable, retrying",
+                context={"server": self.fallback_server_host},
                 trace_id="datanadhi-drain-worker",
                 _datanadhi_internal=True,
             )
 
-    def _wait_for_healthy_server(self, session) -> bool:
-        """Wait for fallback server health (10s timeout). Returns success."""
-        max_attempts = 100  # 10 seconds max wait
-
-        for _ in range(max_attempts):
-            try:
-                if self.health_check_fn(session, self.fallback_server_host):
-                    return True
-            except Exception:
-                pass
+        else:
+            # Other error, mark as done (drop items)
+            self._drop_batch(
+                items, "drain_worker_failed", {"status_code": result.get("status_code")}
+            )
 
-            time.sleep(0.1)
+    def _drop_batch(self, items: list[tuple], reason: str, context: dict):
+        """Persist a batch to the dropped folder and mark it done."""
+        try:
+            file_path = store_dropped_data(self.datanadhi_dir, items, reason)
+        except Exception as e:
+            file_path = None
+            context = {**context, "store_error": str(e)}
+        finally:
+            self.queue.task_done_n(len(items))
+        self.logger.error(
+            "Drain worker batch failed, data dropped",
+            context={**context, "batch_size": len(items), "file": file_path},
+            trace_id="datanadhi-drain-worker",
+            _datanadhi_internal=True,
+        )
 
-        return False
+    def _wait_for_healthy_server(self) -> bool:
+        """Wait for fallback server health (10s timeout). Returns success."""
+        return self.health_monitor.wait_for_recovery(
+            self.fallback_server_host, is_fallback=True, timeout=10.0
+        )
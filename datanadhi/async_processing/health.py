@@ -9,22 +9,57 @@ import requests
 class ServerHealthMonitor:
     """Track server health and run background recovery checks."""
 
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, poll_interval: float = 0.05, timeout: float = 0.25):
+        """Defaults suit loopback servers; remote ones override per call."""
+        self.poll_interval = poll_interval
+        self.timeout = timeout
         self.session = requests.Session()
         self._is_healthy = {}  # {server_key: bool}
         self._lock = threading.Lock()
         self._check_threads = {}  # {server_key: thread}
+        self._recovered_events = {}  # {server_key: Event}, set while healthy
         self.logger = logger
 
     def _get_key(self, server_host: str, is_fallback: bool = False) -> str:
         """Generate unique key for server (prefixed if fallback)."""
         return f"fallback:{server_host}" if is_fallback else server_host
 
+    def health_event(
+        self, server_host: str, is_fallback: bool = False
+    ) -> threading.Event:
+        """Get event that is set while the server is healthy.
+
+        Hot loops can hold on to it and call is_set() instead of is_server_up.
+        """
+        return self._get_event(self._get_key(server_host, is_fallback))
+
+    def _get_event(self, key: str) -> threading.Event:
+        """Get or create recovery event for key (set means healthy)."""
+        event = self._recovered_events.get(key)
+        if event is None:
+            with self._lock:
+                event = self._recovered_events.get(key)
+                if event is None:
+                    event = threading.Event()
+                    if self._is_healthy.get(key, True):
+                        event.set()
+                    self._recovered_events[key] = event
+        return event
+
     def set_health_down(
-        self, server_host: str, is_fallback: bool = False, health_check_fn=None
+        self,
+        server_host: str,
+        is_fallback: bool = False,
+        health_check_fn=None,
+        poll_interval: float | None = None,
+        timeout: float | None = None,
     ):
-        """Mark server down and start background health checker."""
+        """Mark server down and start background health checker.
+
+        poll_interval and timeout default to the monitor-wide values.
+        """
         key = self._get_key(server_host, is_fallback)
+        event = self._get_event(key)
 
         with self._lock:
             if self._is_healthy.get(key, True):
@@ -36,6 +71,7 @@ class ServerHealthMonitor:
                         _datanadhi_internal=True,
                     )
                 self._is_healthy[key] = False
+                event.clear()
 
             # Start health checker if not already running
             if (
@@ -44,7 +80,13 @@ class ServerHealthMonitor:
             ):
                 thread = threading.Thread(
                     target=self._health_check_loop,
-                    args=(server_host, is_fallback, health_check_fn),
+                    args=(
+                        server_host,
+                        is_fallback,
+                        health_check_fn,
+                        poll_interval or self.poll_interval,
+                        timeout or self.timeout,
+                    ),
                     daemon=True,
                     name=f"health-{key}",
                 )
@@ -56,24 +98,40 @@ class ServerHealthMonitor:
         key = self._get_key(server_host, is_fallback)
         return self._is_healthy.get(key, True)
 
-    def _health_check_loop(self, server_host: str, is_fallback: bool, health_check_fn):
+    def wait_for_recovery(
+        self, server_host: str, is_fallback: bool = False, timeout: float | None = None
+    ) -> bool:
+        """Block until server is healthy or timeout expires. Returns health."""
+        key = self._get_key(server_host, is_fallback)
+        return self._get_event(key).wait(timeout)
+
+    def _health_check_loop(
+        self,
+        server_host: str,
+        is_fallback: bool,
+        health_check_fn,
+        poll_interval: float,
+        timeout: float,
+    ):
         """Poll server health until recovery, then exit."""
         key = self._get_key(server_host, is_fallback)
+        event = self._get_event(key)
 
         while True:
-            time.sleep(0.5)
+            time.sleep(poll_interval)
 
             try:
                 # Use provided health check function or default
                 if health_check_fn:
-                    healthy = health_check_fn(self.session, server_host)
+                    healthy = health_check_fn(self.session, server_host, timeout)
                 else:
-                    healthy = self._default_health_check(server_host)
+                    healthy = self._default_health_check(server_host, timeout)
 
                 if healthy:
                     with self._lock:
                         self._is_healthy[key] = True
-                        if self.logger:
+                        event.set()
+                        if self.logger and self.logger.debug_enabled:
                             self.logger.debug(
                                 "Server recovered",
                                 context={"server": key},
@@ -91,10 +149,10 @@ class ServerHealthMonitor:
                     )
                 continue
 
-    def _default_health_check(self, server_host: str) -> bool:
+    def _default_health_check(self, server_host: str, timeout: float) -> bool:
         """Check server health via GET request to root."""
         try:
-            response = self.session.get(f"{server_host}/", timeout=2)
+            response = self.session.get(f"{server_host}/", timeout=timeout)
             return 200 <= response.status_code < 300
         except Exception:
             return False
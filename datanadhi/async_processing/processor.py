@@ -3,31 +3,46 @@
 import atexit
 import threading
 import time
+from functools import partial
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from datanadhi.async_processing.drain_worker import DrainWorker
 from datanadhi.async_processing.health import ServerHealthMonitor
-from datanadhi.async_processing.queue import SafeQueue
+from datanadhi.async_processing.queue import SENTINEL, ShardedQueue
 from datanadhi.echopost import binary as echopost
 from datanadhi.server import fallback as fallback_server
 from datanadhi.server import primary as primary_server
 from datanadhi.utils.files import store_dropped_data
 
 # Global instances
-_PROCESSORS = {}
+_PROCESSORS: dict[str, "AsyncProcessor"] = {}
 _LOCK = threading.Lock()
 
+# Primary is usually remote, so it gets a slower, more tolerant health check
+# than the monitor defaults (tuned for a fallback on the local network)
+PRIMARY_HEALTH_POLL_INTERVAL = 0.5
+PRIMARY_HEALTH_TIMEOUT = 2.0
+
+# Max items a worker takes per wakeup when primary is up
+PRIMARY_BATCH_SIZE = 10
+ECHOPOST_BATCH_SIZE = 100
+
 
 def get_processor_for_directory(
     datanadhi_dir: Path, config: dict, logger
 ) -> "AsyncProcessor":
-    """Get or create processor for directory (singleton per directory)."""
-    key = str(datanadhi_dir.absolute())
+    """Get or create processor for directory (singleton per directory).
 
-    if key in _PROCESSORS:
-        return _PROCESSORS[key]
+    datanadhi_dir must already be absolute; it is used as the key as-is.
+    """
+    key = str(datanadhi_dir)
+
+    processor = _PROCESSORS.get(key)
+    if processor is not None:
+        return processor
 
     with _LOCK:
         if key not in _PROCESSORS:
@@ -39,7 +54,8 @@ class AsyncProcessor:
     """Async processor managing workers, queue, and delivery routing."""
 
     def __init__(self, datanadhi_dir: Path, config: dict, logger):
-        self.datanadhi_dir = Path(datanadhi_dir).absolute()
+        # Already absolute, see get_processor_for_directory
+        self.datanadhi_dir = Path(datanadhi_dir)
         self.api_key = config["api_key"]
         self.queue_size = config["async_queue_size"]
         self.server_host = config["server_host"]
@@ -47,64 +63,118 @@ class AsyncProcessor:
         self.worker_count = config["async_workers"]
         self.exit_timeout = config["async_exit_timeout"]
         self.echopost_disabled = config["echopost_disable"]
+        self._echopost_started = False
         self.logger = logger
 
+        # Bind per-processor constants once for the send hot paths
+        self._send_primary = partial(
+            primary_server.send, server_host=self.server_host, api_key=self.api_key
+        )
+        self._send_fallback = partial(
+            fallback_server.send,
+            server_host=self.fallback_server_host,
+            api_key=self.api_key,
+        )
+
         self._shutdown = threading.Event()
-        self.queue = SafeQueue(maxsize=self.queue_size)
+        self.queue = ShardedQueue(
+            self.queue_size, self.worker_count, on_evict=self._store_evicted
+        )
         self.workers = []
 
+        # Shared session so keep-alive connections are reused across workers
+        self.session = self._build_session()
+
         # Initialize health monitor
         self._health_monitor = ServerHealthMonitor(logger=self.logger)
+        self._primary_up = self._health_monitor.health_event(self.server_host)
+        self._fallback_up = self._health_monitor.health_event(
+            self.fallback_server_host, is_fallback=True
+        )
 
         # Initialize drain worker
         self.drain_worker = DrainWorker(
             queue=self.queue,
             fallback_server_host=self.fallback_server_host,
-            api_key=self.api_key,
-            send_fn=fallback_server.send,
+            send_fn=self._send_fallback,
             health_check_fn=primary_server.is_healthy,
+            health_monitor=self._health_monitor,
             logger=self.logger,
             datanadhi_dir=self.datanadhi_dir,
+            session=self.session,
         )
 
         self._start_workers()
+        # atexit runs in reverse order: flush first, then close the session
+        atexit.register(self.session.close)
         atexit.register(self.flush)
 
+    def _build_session(self) -> requests.Session:
+        """Create session with a connection pool sized for all workers."""
+        session = requests.Session()
+        # workers + drain worker + one spare
+        pool_size = self.worker_count + 2
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, pool_block=False
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _store_evicted(self, items: list[tuple]):
+        """Persist items evicted from an overflowing writeback buffer."""
+        file_path = store_dropped_data(self.datanadhi_dir, items, "writeback_overflow")
+        self.logger.error(
+            "Writeback buffer full, data dropped",
+            context={"batch_size": len(items), "file": file_path},
+            trace_id="datanadhi-async-worker",
+            _datanadhi_internal=True,
+        )
+
     def _start_workers(self):
         """Start background worker threads as daemons."""
         for i in range(self.worker_count):
             t = threading.Thread(
-                target=self._worker_loop, name=f"datanadhi-{i}", daemon=True
+                target=self._worker_loop,
+                args=(i,),
+                name=f"datanadhi-{i}",
+                daemon=True,
             )
             t.start()
             self.workers.append(t)
 
-    def _worker_loop(self):
+    def _worker_loop(self, shard_index: int):
         """Main worker loop processing items and routing to servers."""
-        session = requests.Session()
+        session = self.session
+        self.queue.bind_shard(shard_index)
 
         try:
             while not self._shutdown.is_set():
                 item = self.queue.get(timeout=1.0)
 
+                if item is SENTINEL:
+                    # Queue closed and drained, processor is shutting down
+                    break
+
                 if item is None:
-                    # Queue empty, sleep briefly
-                    time.sleep(0.1)
+                    # get() already blocked for the timeout, just re-check
                     continue
 
                 # Route based on primary server health
-                if self._health_monitor.is_server_up(self.server_host):
+                if self._primary_up.is_set():
                     self._send_to_primary(session, item)
                 else:
                     # Primary down, use fallback strategy
                     if self.echopost_disabled:
-                        if self._health_monitor.is_server_up(
-                            self.fallback_server_host, is_fallback=True
-                        ):
+                        if self._fallback_up.is_set():
                             self._send_to_fallback_server(session, item)
                         else:
-                            self.queue.writeback_batch([item])
-                            time.sleep(0.01)
+                            self.queue.writeback_one(item)
+                            self._health_monitor.wait_for_recovery(
+                                self.fallback_server_host,
+                                is_fallback=True,
+                                timeout=0.5,
+                            )
                     else:
                         self._send_to_echopost(item)
 
@@ -115,62 +185,74 @@ class AsyncProcessor:
                 trace_id="datanadhi-async-worker",
                 _datanadhi_internal=True,
             )
-        finally:
-            session.close()
 
     def _send_to_primary(self, session: requests.Session, item: tuple):
-        """Send item to primary server."""
-        try:
-            pipelines, payload = item
-            result = primary_server.send(
-                session,
-                self.server_host,
-                {"pipelines": pipelines, "log_data": payload},
-                self.api_key,
-            )
-
-            if result["success"]:
-                self.queue.task_done()
-                return
-
-            if result["is_unavailable"]:
-                # Server down, requeue and mark unhealthy
-                self.queue.writeback_batch([item])
-                self._health_monitor.set_health_down(
-                    self.server_host, health_check_fn=primary_server.is_healthy
-                )
-                self.logger.warning(
-                    "Primary server unavailable, requeued",
-                    context={"server": self.server_host},
-                    trace_id="datanadhi-async-worker",
-                    _datanadhi_internal=True,
+        """Send item plus queued backlog to primary server.
+
+        Primary has no batch endpoint, so items are posted one by one over the
+        kept-alive session; pulling them in one go saves a queue round-trip
+        per item.
+        """
+        items = [item] + self.queue.get_batch(PRIMARY_BATCH_SIZE - 1)
+        done = 0
+
+        for index, current in enumerate(items):
+            try:
+                pipelines, payload = current
+                result = self._send_primary(
+                    session, payload={"pipelines": pipelines, "log_data": payload}
                 )
-                return
 
-            if result["is_failure"]:
-                # Client/server error, drop item
-                file_path = store_dropped_data(
-                    self.datanadhi_dir, [item], "primary_failed"
-                )
+                if result["success"]:
+                    done += 1
+                    continue
+
+                if result["is_unavailable"]:
+                    # Server down, requeue the rest and mark unhealthy
+                    self.queue.writeback_many(items[index:])
+                    self._health_monitor.set_health_down(
+                        self.server_host,
+                        health_check_fn=primary_server.is_healthy,
+                        poll_interval=PRIMARY_HEALTH_POLL_INTERVAL,
+                        timeout=PRIMARY_HEALTH_TIMEOUT,
+                    )
+                    self.logger.warning(
+                        "Primary server unavailable, requeued",
+                        context={
+                            "server": self.server_host,
+                            "batch_size": len(items) - index,
+                        },
+                        trace_id="datanadhi-async-worker",
+                        _datanadhi_internal=True,
+                    )
+                    break
+
+                if result["is_failure"]:
+                    # Client/server error, drop item
+                    file_path = store_dropped_data(
+                        self.datanadhi_dir, [current], "primary_failed"
+                    )
+                    self.logger.error(
+                        "Primary send failed, data dropped",
+                        context={
+                            "status_code": result["status_code"],
+                            "file": file_path,
+                        },
+                        trace_id="datanadhi-async-worker",
+                        _datanadhi_internal=True,
+                    )
+                    done += 1
+
+            except Exception as e:
                 self.logger.error(
-                    "Primary send failed, data dropped",
-                    context={
-                        "status_code": result["status_code"],
-                        "file": file_path,
-                    },
+                    "Primary send error, dropped",
+                    context={"error": str(e)},
                     trace_id="datanadhi-async-worker",
                     _datanadhi_internal=True,
                 )
-                self.queue.task_done()
+                done += 1
 
-        except Exception as e:
-            self.logger.error(
-                "Primary send error, dropped",
-                context={"error": str(e)},
-                trace_id="datanadhi-async-worker",
-                _datanadhi_internal=True,
-            )
-            self.queue.task_done()
+        self.queue.task_done_n(done)
 
     def _send_to_fallback_server(self, session: requests.Session, item: tuple):
         """Send batch to fallback server."""
@@ -178,22 +260,16 @@ class AsyncProcessor:
             # Collect batch of items
             items = [item] + self.queue.get_batch(99)  # Total 100
 
-            # Convert to payload format
-            payloads = [{"pipelines": it[0], "log_data": it[1]} for it in items]
-
             # Send to fallback
-            result = fallback_server.send(
-                session, self.fallback_server_host, payloads, self.api_key
-            )
+            result = self._send_fallback(session, items=items)
 
             if result["success"]:
-                for _ in items:
-                    self.queue.task_done()
+                self.queue.task_done_n(len(items))
                 return
 
             if result["is_unavailable"]:
                 # Fallback server down, requeue
-                self.queue.writeback_batch(items)
+                self.queue.writeback_many(items)
                 self._health_monitor.set_health_down(
                     self.fallback_server_host,
                     is_fallback=True,
@@ -225,8 +301,7 @@ class AsyncProcessor:
                     trace_id="datanadhi-async-worker",
                     _datanadhi_internal=True,
                 )
-                for _ in items:
-                    self.queue.task_done()
+                self.queue.task_done_n(len(items))
 
         except Exception as e:
             self.logger.error(
@@ -236,40 +311,41 @@ class AsyncProcessor:
                 _datanadhi_internal=True,
             )
             # Try to mark items as done to avoid blocking
-            for _ in items:
-                try:
-                    self.queue.task_done()
-                except Exception:
-                    pass
+            try:
+                self.queue.task_done_n(len(items))
+            except Exception:
+                pass
 
     def _send_to_echopost(self, item: tuple):
-        """Send item to EchoPost via gRPC."""
+        """Send item plus queued backlog to EchoPost via gRPC."""
+        items = [item]
         try:
-            started = echopost.start_if_socket_not_exists(
-                self.datanadhi_dir, self.api_key, self.server_host
-            )
+            if not self._echopost_started:
+                started = echopost.start_if_socket_not_exists(
+                    self.datanadhi_dir, self.api_key, self.server_host
+                )
 
-            if not started:
-                self.echopost_disabled = True
-                self.queue.writeback_batch([item])
-                return
+                if not started:
+                    self.echopost_disabled = True
+                    self.queue.writeback_one(item)
+                    return
+                self._echopost_started = True
 
-            pipelines, payload = item
-            sent = echopost.send_log_over_unix_grpc(
-                self.datanadhi_dir,
-                pipelines=pipelines,
-                payload=payload,
-                api_key=self.api_key,
+            items += self.queue.get_batch(ECHOPOST_BATCH_SIZE - 1)
+            results = echopost.send_logs_over_unix_grpc(
+                self.datanadhi_dir, items, api_key=self.api_key
             )
+            failed = [current for current, sent in zip(items, results) if not sent]
+            self.queue.task_done_n(len(items) - len(failed))
 
-            if sent:
-                self.queue.task_done()
-            else:
+            if failed:
                 # Failed, disable echopost and requeue
+                self._echopost_started = False
                 self.echopost_disabled = True
-                self.queue.writeback_batch([item])
+                self.queue.writeback_many(failed)
                 self.logger.error(
                     "Echopost send failed, requeued",
+                    context={"batch_size": len(failed)},
                     trace_id="datanadhi-async-worker",
                     _datanadhi_internal=True,
                 )
@@ -281,8 +357,9 @@ class AsyncProcessor:
                 trace_id="datanadhi-async-worker",
                 _datanadhi_internal=True,
             )
+            self._echopost_started = False
             self.echopost_disabled = True
-            self.queue.writeback_batch([item])
+            self.queue.writeback_many(items)
 
     def submit(self, pipelines: list[str], payload: dict) -> bool:
         """Submit log for async processing. Returns True if queued."""
@@ -294,19 +371,16 @@ class AsyncProcessor:
 
         return success
 
-    def _wait_till_drain_complete(self):
-        """Block until queue is empty."""
-        while not self.queue.empty():
-            time.sleep(0.1)
+    def _wait_till_drain_complete(self) -> bool:
+        """Block until every queued item is processed, up to exit_timeout."""
+        return self.queue.join(timeout=self.exit_timeout)
 
     def flush(self):
         """Wait for queue to drain on exit (best-effort with timeout)."""
         if not self._shutdown.is_set():
-
-            def wait_for_queue():
-                self.queue.join()
-
-            thread = threading.Thread(target=wait_for_queue)
-            thread.start()
-            thread.join(timeout=self.exit_timeout)
+            # Workers exit as soon as their shard is drained
+            self.queue.close()
+            deadline = time.monotonic() + self.exit_timeout
+            for worker in self.workers:
+                worker.join(timeout=max(0.0, deadline - time.monotonic()))
             self._shutdown.set()
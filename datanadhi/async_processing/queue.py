@@ -1,7 +1,15 @@
 """Thread-safe queue with batch operations and overflow handling."""
 
+import itertools
 import threading
-from queue import Empty, Full, Queue
+import time
+from collections import deque
+
+# Returned by get() once the queue is closed and drained
+SENTINEL = object()
+
+# Writeback buffer cap, as a multiple of maxsize
+WRITEBACK_BUFFER_FACTOR = 10
 
 
 class SafeQueue:
@@ -10,41 +18,135 @@ class SafeQueue:
     Features:
     - get() returns None instead of raising Empty
     - get_batch(n) retrieves up to n items
-    - writeback_batch(items) can temporarily expand beyond maxsize
+    - writeback_batch(items) can temporarily expand beyond maxsize, up to
+      WRITEBACK_BUFFER_FACTOR x maxsize; past that the oldest buffered items
+      are evicted and handed to on_evict
     - Tracks fill percentage for overflow detection
+    - close() makes get() return SENTINEL once drained, so workers can exit
+
+    Items live in a deque guarded by a single mutex, instead of queue.Queue's
+    mutex plus three conditions. Producers never block, and only signal the
+    not-empty condition when a consumer is actually waiting on it.
     """
 
-    def __init__(self, maxsize: int):
+    __slots__ = (
+        "maxsize",
+        "evicted_count",
+        "_on_evict",
+        "_writeback_buffer_max",
+        "_queue",
+        "_mutex",
+        "_not_empty",
+        "_waiting",
+        "_all_tasks_done",
+        "_unfinished_tasks",
+        "_closed",
+        "_lock",
+        "_writeback_buffer",
+    )
+
+    def __init__(self, maxsize: int, on_evict=None):
         self.maxsize = maxsize
-        self._queue = Queue(maxsize=maxsize)
+        self.evicted_count = 0
+        self._on_evict = on_evict
+        self._writeback_buffer_max = (
+            maxsize * WRITEBACK_BUFFER_FACTOR if maxsize > 0 else None
+        )
+        self._queue = deque()
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._waiting = 0  # consumers blocked on _not_empty
+        self._all_tasks_done = threading.Condition(self._mutex)
+        self._unfinished_tasks = 0
+        self._closed = False
         self._lock = threading.Lock()
         self._writeback_buffer = []  # Temporary buffer for failed items
 
+    def _buffer(self, items: list[tuple], front: bool = False):
+        """Stash items in the writeback buffer, evicting the oldest past the cap."""
+        with self._lock:
+            if front:
+                self._writeback_buffer[:0] = items
+            else:
+                self._writeback_buffer.extend(items)
+            if self._writeback_buffer_max is None:
+                return
+            excess = len(self._writeback_buffer) - self._writeback_buffer_max
+            if excess <= 0:
+                return
+            evicted = self._writeback_buffer[:excess]
+            del self._writeback_buffer[:excess]
+            # Counted under the lock: several workers may write back at once
+            self.evicted_count += excess
+
+        self.task_done_n(len(evicted))
+        if self._on_evict:
+            self._on_evict(evicted)
+
+    def _put_nowait(self, item: tuple, new_task: bool = False) -> bool:
+        """Push item if there is room. Returns False if full."""
+        with self._mutex:
+            if 0 < self.maxsize <= len(self._queue):
+                return False
+            self._queue.append(item)
+            if new_task:
+                self._unfinished_tasks += 1
+            if self._waiting:
+                self._not_empty.notify()
+            return True
+
     def add(self, item: tuple) -> bool:
         """Add item to queue. Returns True if successful, False if full."""
-        try:
-            self._queue.put_nowait(item)
-            return True
-        except Full:
-            return False
+        return self._put_nowait(item, new_task=True)
 
-    def _get(self, timeout: float = 1.0) -> tuple | None:
-        """Get one item from queue. Returns None if empty."""
-        try:
-            return self._queue.get(block=True, timeout=timeout)
-        except Empty:
-            return None
+    def _get(self, timeout: float = 1.0) -> tuple | object | None:
+        """Get one item from queue. Returns None if empty, SENTINEL if closed."""
+        with self._not_empty:
+            if not self._queue and not self._closed and timeout:
+                self._waiting += 1
+                try:
+                    self._not_empty.wait_for(
+                        lambda: self._queue or self._closed, timeout
+                    )
+                finally:
+                    self._waiting -= 1
+            if self._queue:
+                return self._queue.popleft()
+            return SENTINEL if self._closed else None
 
-    def get(self, timeout: float = 1.0) -> tuple | None:
+    def get(self, timeout: float = 1.0) -> tuple | object | None:
         """Get one item, attempting writeback drain first."""
         item = self._get(timeout=timeout)
         self._try_drain_writeback()
-        if item is None:
-            return self._get(timeout=timeout)
+        if item is None or item is SENTINEL:
+            # Only pick up what the writeback drain pushed; waiting the full
+            # timeout again would delay an idle worker's next steal attempt
+            return self._get(timeout=0)
         return item
 
+    def close(self):
+        """Wake idle consumers; get() returns SENTINEL once drained."""
+        with self._mutex:
+            self._closed = True
+            self._not_empty.notify_all()
+
+    def _push_many(self, items: list[tuple]) -> int:
+        """Append as many items as fit in one go. Returns count pushed."""
+        with self._mutex:
+            free = len(items)
+            if self.maxsize > 0:
+                free = min(free, max(0, self.maxsize - len(self._queue)))
+            self._queue.extend(items[:free])
+            if free and self._waiting:
+                self._not_empty.notify(free)
+            return free
+
     def _try_drain_writeback(self):
         """Try draining writeback buffer to queue without blocking."""
+        if not self._writeback_buffer:
+            # Unlocked peek: get() calls this every time and the buffer is
+            # almost always empty, so skip the lock in the common case
+            return
         with self._lock:
             if not self._writeback_buffer:
                 return
@@ -53,74 +155,102 @@ class SafeQueue:
             buf = self._writeback_buffer
             self._writeback_buffer = []
 
-        for item in buf:
-            try:
-                self._queue.put_nowait(item)
-            except Full:
-                # queue became full again → put rest back
-                with self._lock:
-                    self._writeback_buffer.append(item)
-                break
+        pushed = self._push_many(buf)
+        if pushed < len(buf):
+            # queue became full again → put rest back ahead of newer failures
+            self._buffer(buf[pushed:], front=True)
 
     def get_batch(self, n: int) -> list[tuple]:
         """Get up to n items from queue without blocking."""
-        items = []
-        for _ in range(n):
-            try:
-                items.append(self._queue.get_nowait())
-            except Empty:
-                break
-        return items
+        with self._mutex:
+            if n >= len(self._queue):
+                # Whole backlog fits: copy and clear in C, no per-item calls
+                items = list(self._queue)
+                self._queue.clear()
+                return items
+            popleft = self._queue.popleft
+            return [popleft() for _ in range(n)]
 
     def writeback_batch(self, items: list[tuple]) -> int:
-        """Write back items to queue or buffer. Returns count written."""
-        written = 0
+        """Write back items to queue or buffer. Returns count written.
 
-        # First try to write from buffer if any
+        Buffered items go first, then the new ones; whatever does not fit is
+        kept in the buffer. Written-back items were already counted as tasks
+        when first added.
+        """
         with self._lock:
-            if self._writeback_buffer:
-                buffer_copy = self._writeback_buffer.copy()
-                self._writeback_buffer.clear()
-
-                for item in buffer_copy:
-                    try:
-                        self._queue.put_nowait(item)
-                        written += 1
-                    except Full:
-                        self._writeback_buffer.append(item)
-                        break
-
-        # Now try to write back new items
-        for item in items:
-            try:
-                self._queue.put_nowait(item)
-                written += 1
-            except Full:
-                # Store in buffer for later
-                with self._lock:
-                    self._writeback_buffer.append(item)
+            pending = self._writeback_buffer + items
+            self._writeback_buffer = []
 
+        written = self._push_many(pending)
+        if written < len(pending):
+            self._buffer(pending[written:], front=True)
         return written
 
+    def writeback_one(self, item: tuple):
+        """Return one item to the front of the queue, or buffer it if full."""
+        with self._mutex:
+            if not 0 < self.maxsize <= len(self._queue):
+                self._queue.appendleft(item)
+                if self._waiting:
+                    self._not_empty.notify()
+                return
+        self._buffer([item], front=True)
+
+    def writeback_many(self, items: list[tuple]):
+        """Return items to the front of the queue in order, buffering overflow."""
+        with self._mutex:
+            free = len(items)
+            if self.maxsize > 0:
+                free = max(0, self.maxsize - len(self._queue))
+            self._queue.extendleft(reversed(items[:free]))
+            if self._waiting:
+                self._not_empty.notify(min(free, len(items)))
+        if free < len(items):
+            self._buffer(items[free:], front=True)
+
     def task_done(self):
         """Mark task as done."""
-        self._queue.task_done()
+        self.task_done_n(1)
 
-    def join(self):
-        """Block until all tasks are done."""
-        self._queue.join()
+    def task_done_n(self, n: int):
+        """Mark n tasks as done under a single lock acquisition."""
+        if n <= 0:
+            return
+        with self._all_tasks_done:
+            unfinished = self._unfinished_tasks - n
+            if unfinished < 0:
+                raise ValueError("task_done_n() called too many times")
+            if unfinished == 0:
+                self._all_tasks_done.notify_all()
+            self._unfinished_tasks = unfinished
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Block until all tasks are done or timeout expires. Returns success."""
+        with self._all_tasks_done:
+            if timeout is None:
+                while self._unfinished_tasks:
+                    self._all_tasks_done.wait()
+                return True
+            deadline = time.monotonic() + timeout
+            while self._unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._all_tasks_done.wait(remaining)
+            return True
 
     def qsize(self) -> int:
         """Get approximate queue size."""
-        return self._queue.qsize()
+        return len(self._queue)
 
     def empty(self) -> bool:
         """Check if queue is empty."""
-        return self._queue.empty() and not self._writeback_buffer
+        return not self._queue and not self._writeback_buffer
 
     def fill_percentage(self) -> float:
         """Get fill percentage (0.0 to 1.0+). Includes writeback buffer."""
-        queue_size = self._queue.qsize()
+        queue_size = len(self._queue)
         buffer_size = len(self._writeback_buffer)
         total = queue_size + buffer_size
         return total / self.maxsize if self.maxsize > 0 else 0.0
@@ -128,4 +258,126 @@ class SafeQueue:
     @property
     def unfinished_tasks(self) -> int:
         """Get number of unfinished tasks."""
-        return self._queue.unfinished_tasks
+        return self._unfinished_tasks
+
+
+class ShardedQueue:
+    """SafeQueue split into per-worker shards to cut cross-worker contention.
+
+    Producers spread items round-robin across shards. Each worker binds to
+    its own shard and only steals from the fullest shard when its own is
+    empty. Items never move between shards: task_done, get_batch and
+    writeback_batch act on the shard the calling thread last took from.
+    """
+
+    def __init__(self, maxsize: int, shard_count: int, on_evict=None):
+        self.maxsize = maxsize
+        shard_count = max(1, shard_count)
+        shard_size = -(-maxsize // shard_count) if maxsize > 0 else 0
+        self._shards = [
+            SafeQueue(maxsize=shard_size, on_evict=on_evict) for _ in range(shard_count)
+        ]
+        self._next_shard = itertools.count()
+        self._local = threading.local()
+
+    def bind_shard(self, index: int):
+        """Bind the calling worker thread to its home shard."""
+        self._local.home = self._shards[index % len(self._shards)]
+
+    def _fullest(self) -> SafeQueue:
+        """Get the shard with the highest fill percentage."""
+        return max(self._shards, key=SafeQueue.fill_percentage)
+
+    def _current(self) -> SafeQueue:
+        """Get the shard the calling thread last took items from."""
+        return getattr(self._local, "shard", None) or self._shards[0]
+
+    def add(self, item: tuple) -> bool:
+        """Add item to the next shard. Returns False if every shard is full."""
+        start = next(self._next_shard)
+        count = len(self._shards)
+        for offset in range(count):
+            if self._shards[(start + offset) % count].add(item):
+                return True
+        return False
+
+    def get(self, timeout: float = 1.0) -> tuple | object | None:
+        """Get one item from the home shard, stealing first if it is empty."""
+        home = getattr(self._local, "home", None) or self._fullest()
+        if home.empty():
+            shard = self._fullest()
+            if shard is not home:
+                items = shard.get_batch(1)
+                if items:
+                    self._local.shard = shard
+                    return items[0]
+        self._local.shard = home
+        return home.get(timeout=timeout)
+
+    def close(self):
+        """Close every shard."""
+        for shard in self._shards:
+            shard.close()
+
+    def get_batch(self, n: int) -> list[tuple]:
+        """Get up to n items without blocking.
+
+        Bound workers continue from their current shard; unbound callers
+        (the drain worker) take from the fullest shard.
+        """
+        if getattr(self._local, "home", None) is None:
+            self._local.shard = self._fullest()
+        return self._current().get_batch(n)
+
+    def writeback_batch(self, items: list[tuple]) -> int:
+        """Write back items to the shard they were taken from."""
+        return self._current().writeback_batch(items)
+
+    def writeback_one(self, item: tuple):
+        """Write back one item to the shard it was taken from."""
+        self._current().writeback_one(item)
+
+    def writeback_many(self, items: list[tuple]):
+        """Write back items to the shard they were taken from."""
+        self._current().writeback_many(items)
+
+    def task_done(self):
+        """Mark task as done."""
+        self._current().task_done_n(1)
+
+    def task_done_n(self, n: int):
+        """Mark n tasks as done on the current shard."""
+        self._current().task_done_n(n)
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Block until every shard's tasks are done or timeout expires."""
+        if timeout is None:
+            for shard in self._shards:
+                shard.join()
+            return True
+        deadline = time.monotonic() + timeout
+        return all(
+            shard.join(max(0.0, deadline - time.monotonic())) for shard in self._shards
+        )
+
+    def qsize(self) -> int:
+        """Get approximate total size across shards."""
+        return sum(shard.qsize() for shard in self._shards)
+
+    def empty(self) -> bool:
+        """Check if every shard is empty."""
+        return all(shard.empty() for shard in self._shards)
+
+    def fill_percentage(self) -> float:
+        """Get fill percentage of the fullest shard."""
+        return max(shard.fill_percentage() for shard in self._shards)
+
+    @property
+    def evicted_count(self) -> int:
+        """Get number of items evicted from writeback buffers."""
+        return sum(shard.evicted_count for shard in self._shards)
+
+    @property
+    def unfinished_tasks(self) -> int:
+        """Get number of unfinished tasks across shards."""
+        return sum(shard.unfinished_tasks for shard in self._shards)
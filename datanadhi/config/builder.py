@@ -3,104 +3,137 @@ from pathlib import Path
 
 from datanadhi.utils.files import load_from_yaml, write_to_json
 
+CONFIG_MAPPING = {
+    "server_host": {
+        "config": "server.host",
+        "env": "DATANADHI_SERVER_HOST",
+        "default": "http://data-nadhi-server:5000",
+        "strip_trailing_slash": True,
+    },
+    "fallback_server_host": {
+        "config": "server.fallback_host",
+        "env": "DATANADHI_FALLBACK_SERVER_HOST",
+        "default": "http://datanadhi-fallback-server:5001",
+        "strip_trailing_slash": True,
+    },
+    "log_level": {
+        "config": "log.level",
+        "default": "INFO",
+    },
+    "stack_level": {
+        "config": "log.stack_level",
+        "default": 0,
+    },
+    "skip_stack": {
+        "config": "log.skip_stack",
+        "default": 0,
+    },
+    "log_flush_interval_ms": {
+        "config": "log.flush_interval_ms",
+        "env": "DATANADHI_LOG_FLUSH_INTERVAL_MS",
+        "default": 100,
+    },
+    "log_queue_handlers": {
+        "config": "log.queue_handlers",
+        "default": False,
+    },
+    "datanadhi_log_level": {
+        "config": "log.datanadhi_log_level",
+        "default": "INFO",
+    },
+    "echopost_disable": {
+        "config": "echopost.disable",
+        "default": False,
+    },
+    "async_queue_size": {
+        "config": "async.queue_size",
+        "env": "DATANADHI_QUEUE_SIZE",
+        "default": 1000,
+    },
+    "async_workers": {
+        "config": "async.workers",
+        "env": "DATANADHI_WORKERS",
+        "default": 2,
+    },
+    "async_exit_timeout": {
+        "config": "async.exit_timeout",
+        "env": "DATANADHI_EXIT_TIMEOUT",
+        "default": 5,
+    },
+}
+
+# (key, YAML path parts, env var, default) rows with dotted paths pre-split
+_CONFIG_SPECS = tuple(
+    (
+        key,
+        tuple(spec["config"].split(".")) if spec.get("config") else (),
+        spec.get("env"),
+        spec.get("default"),
+    )
+    for key, spec in CONFIG_MAPPING.items()
+)
+
+# URL-valued keys whose trailing "/" is stripped after resolving
+_STRIP_SLASH_KEYS = tuple(
+    key for key, spec in CONFIG_MAPPING.items() if spec.get("strip_trailing_slash")
+)
+
 
 class ConfigBuilder:
     """Build resolved configuration from YAML files and environment variables."""
     
     def __init__(self, datanadhi_dir: Path):
-        self.datanadhi_dir = datanadhi_dir
+        self.datanadhi_dir = Path(datanadhi_dir)
         self.config_yaml = {}
 
-        self.mapping = {
-            "server_host": {
-                "config": "server.host",
-                "env": "DATANADHI_SERVER_HOST",
-                "default": "http://data-nadhi-server:5000",
-            },
-            "fallback_server_host": {
-                "config": "server.fallback_host",
-                "env": "DATANADHI_FALLBACK_SERVER_HOST",
-                "default": "http://datanadhi-fallback-server:5001",
-            },
-            "log_level": {
-                "config": "log.level",
-                "default": "INFO",
-            },
-            "stack_level": {
-                "config": "log.stack_level",
-                "default": 0,
-            },
-            "skip_stack": {
-                "config": "log.skip_stack",
-                "default": 0,
-            },
-            "datanadhi_log_level": {
-                "config": "log.datanadhi_log_level",
-                "default": "INFO",
-            },
-            "echopost_disable": {
-                "config": "echopost.disable",
-                "default": False,
-            },
-            "async_queue_size": {
-                "config": "async.queue_size",
-                "env": "DATANADHI_QUEUE_SIZE",
-                "default": 1000,
-            },
-            "async_workers": {
-                "config": "async.workers",
-                "env": "DATANADHI_WORKERS",
-                "default": 2,
-            },
-            "async_exit_timeout": {
-                "config": "async.exit_timeout",
-                "env": "DATANADHI_EXIT_TIMEOUT",
-                "default": 5,
-            },
-        }
-
         self._load_yaml()
 
     def _load_yaml(self):
         """Load configuration YAML file if it exists."""
         for name in ("config.yml", "config.yaml"):
-            p = Path(self.datanadhi_dir) / name
-            if p.exists():
-                self.config_yaml = load_from_yaml(p)
+            try:
+                # Open directly instead of stat-ing first
+                self.config_yaml = load_from_yaml(self.datanadhi_dir / name)
                 return
+            except FileNotFoundError:
+                continue
         self.config_yaml = {}
 
-    def _from_yaml(self, path: str):
-        """Get value from YAML using dot notation path."""
+    def _from_yaml(self, path: tuple[str, ...]):
+        """Get value from YAML using pre-split dot notation path."""
         cur = self.config_yaml
-        for part in path.split("."):
+        for part in path:
             if not isinstance(cur, dict) or part not in cur:
                 return None
             cur = cur[part]
         return cur
 
-    def _resolve(self, spec: dict):
+    def _resolve(self, path: tuple[str, ...], env: str | None, default):
         """Resolve config value from YAML, env var, or default."""
-        if spec.get("config"):
-            val = self._from_yaml(spec["config"])
+        if path:
+            val = self._from_yaml(path)
             if val is not None:
                 return val
 
-        if spec.get("env"):
-            val = os.getenv(spec["env"])
+        if env:
+            val = os.getenv(env)
             if val is not None:
                 return val
 
-        return spec.get("default")
+        return default
 
     def build(self):
         """Build and return fully resolved configuration dict."""
-        resolved = {k: self._resolve(spec) for k, spec in self.mapping.items()}
-        if resolved["server_host"].endswith("/"):
-            resolved["server_host"] = resolved["server_host"][:-1]
-        if resolved["fallback_server_host"].endswith("/"):
-            resolved["fallback_server_host"] = resolved["fallback_server_host"][:-1]
-        out_path = Path(self.datanadhi_dir) / ".config.resolved.json"
+        resolved = {
+            key: self._resolve(path, env, default)
+            for key, path, env, default in _CONFIG_SPECS
+        }
+        for key in _STRIP_SLASH_KEYS:
+            value = resolved[key]
+            # Trim one trailing slash only, as the per-key checks did before
+            if isinstance(value, str) and value.endswith("/"):
+                resolved[key] = value[:-1]
+        out_path = self.datanadhi_dir / ".config.resolved.json"
         write_to_json(out_path, resolved)
 
         return resolved
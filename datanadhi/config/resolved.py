@@ -1,10 +1,29 @@
+import functools
 import logging
+import os
 from pathlib import Path
 
 from datanadhi.config.builder import ConfigBuilder
 from datanadhi.utils.files import read_from_json
 
 
+def _level_number(level: int | str) -> int:
+    """Normalize a level name (any case) or number to its number.
+
+    Names are looked up per call so levels added by logging.addLevelName
+    after import still resolve.
+    """
+    if isinstance(level, int):
+        return level
+    return logging.getLevelNamesMapping()[level.upper()]
+
+
+@functools.lru_cache(maxsize=16)
+def _read_resolved(path: str, mtime_ns: int) -> dict:
+    """Read a resolved config file; mtime_ns in the key invalidates on edits."""
+    return read_from_json(path)
+
+
 class ResolvedConfig:
     """Load or build resolved configuration with overrides."""
     
@@ -17,14 +36,19 @@ class ResolvedConfig:
     }
 
     def __init__(self, datanadhi_dir: Path, not_set=object(), **kwargs):
-        self.datanadhi_dir = datanadhi_dir
+        self.datanadhi_dir = Path(datanadhi_dir)
         self.overrides = {k: v for k, v in kwargs.items() if v is not not_set}
-        self.path = Path(datanadhi_dir) / ".config.resolved.json"
+        self.path = self.datanadhi_dir / ".config.resolved.json"
 
     def _load_or_build(self):
         """Load existing config or build from scratch."""
-        if self.path.exists():
-            return read_from_json(self.path)
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            pass
+        else:
+            # Copy, since overrides are applied to the returned dict in place
+            return dict(_read_resolved(str(self.path), mtime_ns))
 
         builder = ConfigBuilder(self.datanadhi_dir)
         return builder.build()
@@ -43,10 +67,8 @@ class ResolvedConfig:
         ):
             cfg["echopost_disable"] = True
 
-        cfg["log_level"] = logging._nameToLevel[cfg["log_level"].upper()]
-        cfg["datanadhi_log_level"] = logging._nameToLevel[
-            cfg["datanadhi_log_level"].upper()
-        ]
+        cfg["log_level"] = _level_number(cfg["log_level"])
+        cfg["datanadhi_log_level"] = _level_number(cfg["datanadhi_log_level"])
         return cfg
 
     def get(self):
@@ -1,5 +1,10 @@
+import ctypes
+import os
 import platform
+import select
+import shutil
 import subprocess
+import tempfile
 import threading
 import time
 import urllib.error
@@ -16,6 +21,19 @@ from datanadhi.config import ResolvedConfig
 _LOCKS = {}
 _LOCKS_GUARD = threading.Lock()
 
+# Chunk size for streaming the binary download to disk
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# inotify flags for entries appearing in a directory (linux/inotify.h)
+_IN_CREATE = 0x100
+_IN_MOVED_TO = 0x80
+
+# Open channels and stubs per socket target, reused across sends
+_CHANNELS: dict[str, tuple[grpc.Channel, logagent_pb2_grpc.LogAgentStub]] = {}
+_CHANNELS_GUARD = threading.Lock()
+# Call status codes meaning the channel itself is broken, e.g. EchoPost restarted
+_RECONNECT_CODES = frozenset({grpc.StatusCode.UNAVAILABLE})
+
 
 def get_download_url():
     """Determine EchoPost download URL for current platform."""
@@ -51,10 +69,13 @@ def get_download_url():
 def get_start_lock(datanadhi_dir: Path) -> threading.Lock:
     """Get or create lock for starting EchoPost in this directory."""
     key = str(datanadhi_dir)
-    with _LOCKS_GUARD:
-        if key not in _LOCKS:
-            _LOCKS[key] = threading.Lock()
-        return _LOCKS[key]
+    lock = _LOCKS.get(key)
+    if lock is None:
+        with _LOCKS_GUARD:
+            lock = _LOCKS.get(key)
+            if lock is None:
+                lock = _LOCKS[key] = threading.Lock()
+    return lock
 
 
 def get_echopost_dir(datanadhi_dir: Path):
@@ -98,7 +119,22 @@ def ensure_binary_exists(datanadhi_dir: Path, resolved_config: dict):
                         "status": status,
                         "detail": f"Download returned status {status}",
                     }
-                data = resp.read()
+                # Stream to a private temp file and rename it into place, so
+                # other processes only ever see a complete, executable binary
+                fd, tmp_name = tempfile.mkstemp(
+                    dir=binary_path.parent, prefix=f"{binary_path.name}.tmp."
+                )
+                tmp_path = Path(tmp_name)
+                try:
+                    with open(fd, "wb") as f:
+                        shutil.copyfileobj(resp, f, length=DOWNLOAD_CHUNK_SIZE)
+                        os.fchmod(f.fileno(), 0o755)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, binary_path)
+                except BaseException:
+                    tmp_path.unlink(missing_ok=True)
+                    raise
 
         except urllib.error.HTTPError as e:
             return False, {"type": "http_error", "status": e.code, "detail": e.reason}
@@ -107,9 +143,6 @@ def ensure_binary_exists(datanadhi_dir: Path, resolved_config: dict):
             ResolvedConfig.force_disable_echopost = True
             return False, {"type": "network_error", "detail": str(e)}
 
-        with open(binary_path, "wb") as f:
-            f.write(data)
-        binary_path.chmod(0o755)
         return True, None
 
     except Exception as e:
@@ -151,26 +184,90 @@ def start_echopost_detached(
         return False
 
 
+def _get_stub(target: str) -> logagent_pb2_grpc.LogAgentStub:
+    """Get or open the persistent channel stub for a socket target."""
+    entry = _CHANNELS.get(target)
+    if entry is None:
+        with _CHANNELS_GUARD:
+            entry = _CHANNELS.get(target)
+            if entry is None:
+                channel = grpc.insecure_channel(target)
+                entry = (channel, logagent_pb2_grpc.LogAgentStub(channel))
+                _CHANNELS[target] = entry
+    return entry[1]
+
+
+def _drop_channel(target: str):
+    """Close the cached channel so the next send reconnects (e.g. after restart)."""
+    with _CHANNELS_GUARD:
+        entry = _CHANNELS.pop(target, None)
+    if entry is not None:
+        entry[0].close()
+
+
+def _build_request(pipelines: list[str], payload: dict, api_key: str):
+    """Build a LogRequest for one payload."""
+    return logagent_pb2.LogRequest(
+        json_data=orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS),
+        pipelines=pipelines,
+        api_key=api_key,
+    )
+
+
 def send_log_over_unix_grpc(
     datanadhi_dir: Path, pipelines: list[str], payload: dict, api_key: str
 ) -> bool:
     """Send log to EchoPost via gRPC over Unix socket. Returns success."""
-    socket_path = get_socket_path(datanadhi_dir)
-    target = f"unix://{str(socket_path)}"
-    req = logagent_pb2.LogRequest(
-        json_data=orjson.dumps(payload).decode(),
-        pipelines=pipelines,
-        api_key=api_key,
-    )
+    return send_logs_over_unix_grpc(datanadhi_dir, [(pipelines, payload)], api_key)[0]
+
+
+def send_logs_over_unix_grpc(
+    datanadhi_dir: Path, items: list[tuple[list[str], dict]], api_key: str
+) -> list[bool]:
+    """Send (pipelines, payload) items to EchoPost. Returns success per item.
+
+    All calls are issued up front on the shared channel and awaited after, so
+    a batch costs one round-trip instead of one per item.
+    """
+    target = f"unix://{str(get_socket_path(datanadhi_dir))}"
+    # Encode everything before the first call starts, so an unencodable
+    # payload fails alone instead of abandoning calls already in flight
+    log_requests = []
+    for pipelines, payload in items:
+        try:
+            log_requests.append(_build_request(pipelines, payload, api_key))
+        except TypeError:
+            log_requests.append(None)
 
+    reconnect = False
+    futures = []
     try:
-        # use insecure_channel; close when leaving context
-        with grpc.insecure_channel(target) as channel:
-            stub = logagent_pb2_grpc.LogAgentStub(channel)
-            resp = stub.SendLog(req)
-            return resp.success
+        stub = _get_stub(target)
+        for request in log_requests:
+            futures.append(None if request is None else stub.SendLog.future(request))
     except Exception:
-        return False
+        # Channel unusable (e.g. closed); calls not started count as failed
+        reconnect = True
+
+    results = []
+    for future in futures:
+        if future is None:
+            results.append(False)
+            continue
+        try:
+            results.append(future.result().success)
+        except grpc.RpcError as e:
+            results.append(False)
+            # Only a transport failure warrants a new channel; closing the
+            # shared one would cancel other workers' calls in flight
+            if e.code() in _RECONNECT_CODES:
+                reconnect = True
+        except Exception:
+            results.append(False)
+    results += [False] * (len(items) - len(results))
+    if reconnect:
+        _drop_channel(target)
+    return results
 
 
 def socket_exists(datanadhi_dir: Path) -> bool:
@@ -190,13 +287,82 @@ def delete_socket_if_exists(datanadhi_dir: Path):
         pass
 
 
+def _wait_inotify(socket_path: Path, deadline: float) -> bool | None:
+    """Wait for socket_path via inotify. Returns None if unavailable."""
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (AttributeError, OSError):
+        return None
+    if fd < 0:
+        return None
+
+    try:
+        watch = libc.inotify_add_watch(
+            fd, bytes(socket_path.parent), _IN_CREATE | _IN_MOVED_TO
+        )
+        if watch < 0:
+            return None
+        # Watch is armed before the check, so a creation in between still wakes us
+        while not socket_path.exists():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            readable, _, _ = select.select([fd], [], [], remaining)
+            if readable:
+                os.read(fd, 4096)  # events only signal a change, re-check path
+        return True
+    finally:
+        os.close(fd)
+
+
+def _wait_kqueue(socket_path: Path, deadline: float) -> bool | None:
+    """Wait for socket_path via kqueue. Returns None if unavailable."""
+    if not hasattr(select, "kqueue"):
+        return None
+    try:
+        dir_fd = os.open(socket_path.parent, os.O_RDONLY)
+    except OSError:
+        return None
+
+    kq = select.kqueue()
+    try:
+        event = select.kevent(
+            dir_fd,
+            filter=select.KQ_FILTER_VNODE,
+            flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+            fflags=select.KQ_NOTE_WRITE,
+        )
+        kq.control([event], 0, 0)
+        while not socket_path.exists():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            kq.control(None, 1, remaining)
+        return True
+    finally:
+        kq.close()
+        os.close(dir_fd)
+
+
 def wait_for_socket(
     datanadhi_dir: Path, timeout: float = 2.0, poll_interval: float = 0.05
 ) -> bool:
-    """Wait for EchoPost socket to exist (polls every 50ms)."""
-    start = time.time()
-    while time.time() - start < timeout:
-        if socket_exists(datanadhi_dir):
+    """Wait for EchoPost socket to exist.
+
+    Sleeps on inotify (Linux) or kqueue (macOS) directory events; falls back
+    to polling every poll_interval if neither can be set up.
+    """
+    socket_path = get_socket_path(datanadhi_dir)
+    deadline = time.monotonic() + timeout
+
+    for wait in (_wait_inotify, _wait_kqueue):
+        result = wait(socket_path, deadline)
+        if result is not None:
+            return result
+
+    while time.monotonic() < deadline:
+        if socket_path.exists():
             return True
         time.sleep(poll_interval)
     return False
@@ -1,38 +1,19 @@
 import threading
-import time
 from pathlib import Path
 
 from datanadhi.echopost.binary import (
+    get_start_lock,
     send_log_over_unix_grpc,
     socket_exists,
     start_echopost_detached,
+    wait_for_socket,
 )
 
 
-def wait_for_socket(
-    datanadhi_dir: Path, timeout: float = 2.0, poll_interval: float = 0.05
-) -> bool:
-    """Wait for EchoPost socket to exist (polls every 50ms)."""
-    start = time.time()
-    while time.time() - start < timeout:
-        if socket_exists(datanadhi_dir):
-            return True
-        time.sleep(poll_interval)
-    return False
-
-
 class EchoPostLink:
     """Manage EchoPost startup and communication."""
-    def __init__(self):
-        self._LOCKS = {}
-        self._LOCKS_GUARD = threading.Lock()
-
     def get_start_lock(self, datanadhi_dir: Path) -> threading.Lock:
-        key = str(datanadhi_dir)
-        with self._LOCKS_GUARD:
-            if key not in self._LOCKS:
-                self._LOCKS[key] = threading.Lock()
-            return self._LOCKS[key]
+        return get_start_lock(datanadhi_dir)
 
     def send_to_agent(
         self,
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0elogagent.proto\x12\x08logagent\"C\n\nLogRequest\x12\x11\n\tjson_data\x18\x01 \x01(\t\x12\x11\n\tpipelines\x18\x02 \x03(\t\x12\x0f\n\x07\x61pi_key\x18\x03 \x01(\t\"/\n\x0bLogResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t2B\n\x08LogAgent\x12\x36\n\x07SendLog\x12\x14.logagent.LogRequest\x1a\x15.logagent.LogResponseB*Z(github.com/datanadhi/echopost/logagentpbb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0elogagent.proto\x12\x08logagent\"C\n\nLogRequest\x12\x11\n\tjson_data\x18\x01 \x01(\x0c\x12\x11\n\tpipelines\x18\x02 \x03(\t\x12\x0f\n\x07\x61pi_key\x18\x03 \x01(\t\"/\n\x0bLogResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t2B\n\x08LogAgent\x12\x36\n\x07SendLog\x12\x14.logagent.LogRequest\x1a\x15.logagent.LogResponseB*Z(github.com/datanadhi/echopost/logagentpbb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -1,25 +1,59 @@
 import logging
+import queue
 import sys
+import weakref
+from logging.handlers import QueueListener
 
-from datanadhi.logger.handler import FileHandler, Formatter, Handler, StreamHandler
+from datanadhi.logger.handler import (
+    DEFAULT_FLUSH_INTERVAL_MS,
+    BufferedStreamHandler,
+    FileHandler,
+    Formatter,
+    Handler,
+    RecordQueueHandler,
+    StreamHandler,
+)
 from datanadhi.logger.json_formatter import JsonFormatter
 
-__all__ = ["FileHandler", "StreamHandler", "Formatter", "JsonFormatter", "Handler"]
+__all__ = [
+    "BufferedStreamHandler",
+    "FileHandler",
+    "StreamHandler",
+    "Formatter",
+    "JsonFormatter",
+    "Handler",
+    "RecordQueueHandler",
+]
 
 
-def get_logger(handlers, log_level, module_name, object_id):
-    """Get or create a logger with the specified configuration.
-    
-    Returns existing logger if already configured, otherwise creates new one
-    with provided handlers and log level.
+def get_logger(
+    handlers,
+    log_level,
+    module_name,
+    object_id,
+    flush_interval_ms=DEFAULT_FLUSH_INTERVAL_MS,
+    queue_handlers=False,
+    owner=None,
+):
+    """Create a logger with the specified handlers and log level.
+
+    The logger is registered through logging.getLogger so that
+    logging.disable() and setLevel() reach its level cache. When owner is
+    given, the registry entry is removed once owner is freed, so entries do
+    not accumulate and a later owner reusing the id starts from a fresh
+    logger. The name carries no dots, so the logger hangs directly off root
+    and no parent placeholders hold on to it. With queue_handlers, handler
+    I/O runs on a QueueListener thread.
     """
-    logger = logging.getLogger(f"{module_name}.{object_id}")
-    if logger.handlers:
-        return logger
+    name = f"{module_name}:{object_id}".replace(".", ":")
+    logger = logging.getLogger(name)
+    if owner is not None:
+        weakref.finalize(owner, _release_logger, name)
+    logger.setLevel(log_level)
     if not handlers:
         handlers = [
             Handler(
-                handler=StreamHandler(sys.stdout),
+                handler=BufferedStreamHandler(sys.stdout, flush_interval_ms),
                 formatter=JsonFormatter(),
             )
         ]
@@ -28,7 +62,27 @@ def get_logger(handlers, log_level, module_name, object_id):
         new_handler.setFormatter(h.formatter or JsonFormatter())
         logger.addHandler(new_handler)
 
-    logger.setLevel(log_level)
     logger.propagate = False
 
+    if queue_handlers:
+        _start_queue_listener(logger)
+
     return logger
+
+
+def _release_logger(name: str):
+    """Remove a flat-named logger from the logging registry."""
+    # A single dict pop is atomic, and no other code touches this unique name
+    logging.Logger.manager.loggerDict.pop(name, None)
+
+
+def _start_queue_listener(logger: logging.Logger):
+    """Move the logger's handlers behind a QueueListener thread."""
+    log_queue = queue.Queue()
+    listener = QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(RecordQueueHandler(log_queue))
+    listener.start()
+    # Drains the queue and stops the thread once the logger is freed, or at exit
+    weakref.finalize(logger, listener.stop)
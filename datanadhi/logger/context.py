@@ -3,6 +3,10 @@ import traceback
 
 STACK_LEVEL_OFFSET = 2
 
+# Attribute caching (traceback id, info) on the exception itself, so retry
+# loops logging the same error only format its traceback once
+_EXC_INFO_ATTR = "_datanadhi_exc_info"
+
 
 def _extract_exception_info() -> dict | None:
     """Extract structured exception info from current exception context.
@@ -16,18 +20,27 @@ def _extract_exception_info() -> dict | None:
 
     exc_type, exc_value, exc_tb = exc_info
 
+    cached = getattr(exc_value, _EXC_INFO_ATTR, None)
+    if cached and cached[0] == id(exc_tb):
+        return dict(cached[1])
+
     # Get the traceback frames
     tb_frames = traceback.extract_tb(exc_tb)
     last_frame = tb_frames[-1] if tb_frames else None
 
-    return {
+    info = {
         "type": exc_type.__name__ if exc_type else None,
         "message": str(exc_value) if exc_value else None,
-        "stacktrace": " ".join(traceback.format_exception(*exc_info)),
+        "stacktrace": "".join(traceback.format_exception(*exc_info)),
         "file": last_frame.filename if last_frame else None,
         "line": last_frame.lineno if last_frame else None,
         "function": last_frame.name if last_frame else None,
     }
+    try:
+        setattr(exc_value, _EXC_INFO_ATTR, (id(exc_tb), info))
+    except AttributeError:
+        pass  # exceptions with __slots__ just skip the cache
+    return dict(info)
 
 
 def _extract_stack_info(stack_level) -> dict | None:
@@ -40,15 +53,36 @@ def _extract_stack_info(stack_level) -> dict | None:
     return {"stacktrace": "".join(stack)}
 
 
-def get_context_stack_level(config, context, stack_info, exc_info, stack_level, kwargs):
+def get_context_stack_level(
+    default_stack_level,
+    context,
+    stack_info,
+    exc_info,
+    stack_level,
+    kwargs,
+    enabled=True,
+    depth=0,
+):
+    """Merge kwargs into context and resolve the stack level.
+
+    Exception and stack details are only extracted when enabled, i.e. when
+    the record can actually be emitted. depth counts the frames between the
+    public logging method and this call.
+    """
     if kwargs:
-        context = {**context, **kwargs}
+        # kwargs is already a fresh dict, so it can hold the merge itself
+        context = {**context, **kwargs} if context else kwargs
+    elif context is None:
+        context = {}
 
     stack_level = (
         stack_level + STACK_LEVEL_OFFSET
         if stack_level is not None
-        else config.get("stack_level", STACK_LEVEL_OFFSET)
-    )
+        else default_stack_level
+    ) + depth
+
+    if not enabled:
+        return context, stack_level
 
     # Add exception info to context if requested
     if exc_info:
@@ -1,7 +1,134 @@
+import copy
+import threading
+import time
+import weakref
 from logging import FileHandler, Formatter, StreamHandler
+from logging.handlers import QueueHandler
 
 from pydantic import BaseModel
 
+DEFAULT_FLUSH_INTERVAL_MS = 100
+
+
+# One flusher thread serves every buffered handler; the set holds weakrefs
+# only, so an unused handler can still be freed
+_flush_handlers = weakref.WeakSet()
+_flush_lock = threading.Lock()
+_flush_wakeup = threading.Event()
+_flush_thread = None
+
+
+def _register_for_flush(handler):
+    """Add a handler to the flusher, starting the thread on first use."""
+    global _flush_thread
+    with _flush_lock:
+        _flush_handlers.add(handler)
+        if _flush_thread is None or not _flush_thread.is_alive():
+            _flush_thread = threading.Thread(
+                target=_flush_loop, daemon=True, name="datanadhi-log-flush"
+            )
+            _flush_thread.start()
+    # Re-plan the next wakeup around the new handler's interval
+    _flush_wakeup.set()
+
+
+def _unregister_for_flush(handler):
+    """Remove a handler from the flusher."""
+    with _flush_lock:
+        _flush_handlers.discard(handler)
+
+
+def _flush_due_handlers() -> float | None:
+    """Flush handlers whose interval has elapsed. Returns the next due time."""
+    with _flush_lock:
+        handlers = list(_flush_handlers)
+    now = time.monotonic()
+    next_due = None
+    for handler in handlers:
+        if handler._flush_due <= now:
+            try:
+                handler.flush()
+            except Exception:
+                pass  # A broken stream must not stop flushing the others
+            handler._flush_due = now + handler.flush_interval
+        if next_due is None or handler._flush_due < next_due:
+            next_due = handler._flush_due
+    return next_due
+
+
+def _flush_loop():
+    """Flush every live buffered handler on its own interval, forever."""
+    while True:
+        _flush_wakeup.clear()
+        next_due = _flush_due_handlers()
+        # Sleep until the next handler is due, or until one is registered
+        if next_due is None:
+            _flush_wakeup.wait()
+        else:
+            _flush_wakeup.wait(max(0.0, next_due - time.monotonic()))
+
+
+class BufferedStreamHandler(StreamHandler):
+    """StreamHandler that leaves flushing to a background timer.
+
+    StreamHandler flushes after every record, one write() syscall each. Here
+    records sit in the stream's own buffer and are flushed every
+    flush_interval_ms (and by logging.shutdown at exit). Terminals keep the
+    per-record flush so interactive output is not delayed.
+    """
+
+    def __init__(self, stream=None, flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS):
+        super().__init__(stream)
+        self.flush_interval = flush_interval_ms / 1000
+        self._buffered = flush_interval_ms > 0 and not self._is_tty()
+        self._flush_due = time.monotonic() + self.flush_interval
+        if self._buffered:
+            _register_for_flush(self)
+
+    def _is_tty(self) -> bool:
+        """Check whether the stream is an interactive terminal."""
+        try:
+            return self.stream.isatty()
+        except Exception:
+            return False
+
+    def emit(self, record):
+        """Write the record, deferring the flush unless unbuffered."""
+        if not self._buffered:
+            super().emit(record)
+            return
+        try:
+            msg = self.format(record)
+            self.stream.write(msg + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        """Stop the flush timer, then flush and close as usual."""
+        _unregister_for_flush(self)
+        super().close()
+
+
+class RecordQueueHandler(QueueHandler):
+    """QueueHandler passing records on for the listener's handlers to format.
+
+    QueueHandler.prepare renders records with its own formatter, which would
+    hand the listener's JsonFormatter a pre-formatted string. Here only the
+    message is merged with its args, as those may change after the call.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def join(self):
+        """Block until the listener has handled every queued record."""
+        self.queue.join()
+
 
 class Handler(BaseModel):
     handler: StreamHandler | FileHandler
@@ -20,10 +20,13 @@ Example output:
     }
 """
 
-import datetime
 import json
 import logging
 
+import orjson
+
+from datanadhi.utils.general import utc_iso_timestamp
+
 
 class JsonFormatter(logging.Formatter):
     """Format log records as JSON strings with standardized fields.
@@ -56,9 +59,12 @@ class JsonFormatter(logging.Formatter):
         Returns:
             A JSON string containing all log record fields
         """
-        timestamp = datetime.datetime.now(datetime.UTC).isoformat() + "Z"
+        # Records from Logger carry a timestamp; only build one when missing
+        timestamp = getattr(record, "timestamp", None)
+        if timestamp is None:
+            timestamp = utc_iso_timestamp(record.created)
         entry = {
-            "timestamp": getattr(record, "timestamp", timestamp),
+            "timestamp": timestamp,
             "module_name": record.module,
             "function_name": record.funcName,
             "line_number": record.lineno,
@@ -67,4 +73,10 @@ class JsonFormatter(logging.Formatter):
             "trace_id": getattr(record, "trace_id", None),
             "context": getattr(record, "context", {}),
         }
-        return json.dumps(entry)
+        try:
+            return orjson.dumps(
+                entry, default=str, option=orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except TypeError:
+            # orjson rejects some values outright (e.g. ints wider than 64 bits)
+            return json.dumps(entry, default=str, separators=(",", ":"))
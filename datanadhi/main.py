@@ -1,28 +1,29 @@
-import contextvars
 import logging
 import os
 from pathlib import Path
 
 from dotenv import load_dotenv
 
-from datanadhi.async_processing import get_processor_for_directory
 from datanadhi.config import ResolvedConfig
-from datanadhi.echopost import ensure_binary_exists
-from datanadhi.logger import Handler, get_logger
+from datanadhi.logger import Handler, RecordQueueHandler, get_logger
+from datanadhi.logger.handler import DEFAULT_FLUSH_INTERVAL_MS
 from datanadhi.logger.context import get_context_stack_level
 from datanadhi.rules import (
     ResolvedRules,
     RuleActions,
+    compile_rules,
+    rule_levels,
+)
+from datanadhi.rules.core import (
+    STACK_LEVEL_OFFSET,
+    get_extras,
+    get_rule_result,
+    trace_id_var,  # also re-exported for callers setting trace IDs
 )
-from datanadhi.rules.core import get_extras, get_rule_result
 
 load_dotenv()
 
 _NOT_SET = object()
-trace_id_var = contextvars.ContextVar("trace_id", default=None)
-
-# Global constant for stack level offset
-STACK_LEVEL_OFFSET = 2
 
 
 class Logger:
@@ -49,9 +50,19 @@ class Logger:
             skip_stack=skip_stack,
             echopost_disable=echopost_disable,
         ).get()
+        # Read on every log call, so kept out of the config dict
+        self._stack_level = self.config.get("stack_level", STACK_LEVEL_OFFSET)
+        self._datanadhi_log_level = self.config["datanadhi_log_level"]
         # Initialising logger before echopost so that we can log errors from echopost
         self.logger = get_logger(
-            handlers, self.config["log_level"], self.module_name, id(self)
+            handlers,
+            self.config["log_level"],
+            self.module_name,
+            id(self),
+            # Configs resolved before this option existed do not carry it
+            int(self.config.get("log_flush_interval_ms", DEFAULT_FLUSH_INTERVAL_MS)),
+            bool(self.config.get("log_queue_handlers", False)),
+            owner=self,
         )
         self._initialise_rules_and_echopost()
         # Initialize async processor for non-blocking pipeline triggers
@@ -59,7 +70,40 @@ class Logger:
         self._initialise_processor()
 
     def can_log(self, incoming_level: int):
-        return incoming_level > self.config["datanadhi_log_level"]
+        return incoming_level > self._datanadhi_log_level
+
+    @property
+    def debug_enabled(self) -> bool:
+        """Whether internal DEBUG logs would be emitted.
+
+        Lets hot internal paths skip building log context that would be dropped.
+        """
+        return self.no_rules_set or logging.DEBUG > self._datanadhi_log_level
+
+    def _level_disabled(self, level: int, _datanadhi_internal: bool) -> bool:
+        """Whether a record at level can neither be emitted nor match a rule.
+
+        Such records are dropped before any payload or context is built.
+        """
+        if _datanadhi_internal or self.logger.isEnabledFor(level):
+            return False
+        if self.no_rules_set:
+            return True
+        return self._rule_levels is not None and (
+            logging.getLevelName(level) not in self._rule_levels
+        )
+
+    def _details_needed(self, level: int, _datanadhi_internal: bool) -> bool:
+        """Whether exception/stack details of a record can reach any output.
+
+        Records skipping the rules engine are only emitted if the stdlib
+        logger accepts the level; internal DEBUG records are otherwise dropped.
+        """
+        if self.no_rules_set or (
+            _datanadhi_internal and level > self._datanadhi_log_level
+        ):
+            return self.logger.isEnabledFor(level)
+        return not (_datanadhi_internal and level == logging.DEBUG)
 
     @property
     def _get_internal_trace_id(self) -> str:
@@ -67,8 +111,13 @@ class Logger:
 
     def _initialise_rules_and_echopost(self):
         self.rules: RuleActions = ResolvedRules(self.datanadhi_dir).get()
+        self._evaluate_rules = compile_rules(self.rules)
+        self._rule_levels = rule_levels(self.rules)
         success, error = True, None
         if self.rules:
+            # Imported here so Loggers without rules never load grpc/requests
+            from datanadhi.echopost import ensure_binary_exists
+
             success, error = ensure_binary_exists(self.datanadhi_dir, self.config)
         else:
             self.no_rules_set = True
@@ -106,6 +155,8 @@ class Logger:
     def _initialise_processor(self):
         """Initialize async processor."""
         if not self.no_rules_set and self.rules:
+            from datanadhi.async_processing import get_processor_for_directory
+
             config_with_key = {
                 **self.config,
                 "api_key": self.api_key,
@@ -137,40 +188,48 @@ class Logger:
 
         self._processor.submit(pipelines, payload)
 
-    def debug(
+    def _log(
         self,
+        level: int,
         message: str,
-        context: dict = {},
-        trace_id: str | None = None,
-        exc_info: bool = False,
-        stack_info: bool = False,
-        stacklevel: int | None = None,
-        _datanadhi_internal=False,
-        **kwargs,
+        context: dict | None,
+        trace_id: str | None,
+        exc_info: bool,
+        stack_info: bool,
+        stacklevel: int | None,
+        _datanadhi_internal: bool,
+        kwargs: dict,
     ) -> dict | None:
-        """Log a DEBUG level message with optional context and trace ID.
+        """Shared body of the level methods, which must call it directly.
 
-        Args:
-            message: The log message
-            context: Additional structured data
-            trace_id: Optional trace ID for request tracking
-            exc_info: Include exception information
-            stack_info: Include stack trace
-            stacklevel: Override stack level for caller detection
-            **kwargs: Additional context fields
-
-        Returns:
-            Internal payload dict if rules are set, None otherwise
+        Stack levels account for this extra frame between the caller and the
+        stdlib logger.
         """
+        if self._level_disabled(level, _datanadhi_internal):
+            # A caller-given trace ID still binds for the records that follow
+            if trace_id is not None and not _datanadhi_internal:
+                trace_id_var.set(trace_id)
+            return None
+
         context, stack_level = get_context_stack_level(
-            self.config, context, stack_info, exc_info, stacklevel, kwargs
+            self._stack_level,
+            context,
+            stack_info,
+            exc_info,
+            stacklevel,
+            kwargs,
+            enabled=self._details_needed(level, _datanadhi_internal),
+            depth=1,
         )
 
-        if self.no_rules_set or (_datanadhi_internal and self.can_log(logging.DEBUG)):
+        if self.no_rules_set or (
+            _datanadhi_internal and level > self._datanadhi_log_level
+        ):
             extras = get_extras(
                 context, trace_id, self.module_name, _datanadhi_internal
             )
-            self.logger.debug(
+            self.logger.log(
+                level,
                 message,
                 extra=extras,
                 stacklevel=stack_level,
@@ -178,13 +237,13 @@ class Logger:
                 stack_info=stack_info,
             )
             return None
-        if _datanadhi_internal:
+        if _datanadhi_internal and level == logging.DEBUG:
             return None
 
         rule_result = get_rule_result(
-            self.rules,
+            self._evaluate_rules,
             self.module_name,
-            "DEBUG",
+            logging.getLevelName(level),
             stack_level,
             message,
             context,
@@ -199,7 +258,8 @@ class Logger:
                 _datanadhi_internal,
                 rule_result.payload,
             )
-            self.logger.debug(
+            self.logger.log(
+                level,
                 message,
                 extra=extra,
                 stacklevel=stack_level,
@@ -209,10 +269,10 @@ class Logger:
         self.trigger_pipelines(rule_result.payload, rule_result.pipelines)
         return rule_result.payload
 
-    def info(
+    def debug(
         self,
         message: str,
-        context: dict = {},
+        context: dict | None = None,
         trace_id: str | None = None,
         exc_info: bool = False,
         stack_info: bool = False,
@@ -220,7 +280,7 @@ class Logger:
         _datanadhi_internal=False,
         **kwargs,
     ) -> dict | None:
-        """Log an INFO level message with optional context and trace ID.
+        """Log a DEBUG level message with optional context and trace ID.
 
         Args:
             message: The log message
@@ -234,55 +294,59 @@ class Logger:
         Returns:
             Internal payload dict if rules are set, None otherwise
         """
-        context, stack_level = get_context_stack_level(
-            self.config, context, stack_info, exc_info, stacklevel, kwargs
+        return self._log(
+            logging.DEBUG,
+            message,
+            context,
+            trace_id,
+            exc_info,
+            stack_info,
+            stacklevel,
+            _datanadhi_internal,
+            kwargs,
         )
 
-        if self.no_rules_set or (_datanadhi_internal and self.can_log(logging.INFO)):
-            extras = get_extras(
-                context, trace_id, self.module_name, _datanadhi_internal
-            )
-            self.logger.info(
-                message,
-                extra=extras,
-                stacklevel=stack_level,
-                exc_info=exc_info,
-                stack_info=stack_info,
-            )
-            return None
+    def info(
+        self,
+        message: str,
+        context: dict | None = None,
+        trace_id: str | None = None,
+        exc_info: bool = False,
+        stack_info: bool = False,
+        stacklevel: int | None = None,
+        _datanadhi_internal=False,
+        **kwargs,
+    ) -> dict | None:
+        """Log an INFO level message with optional context and trace ID.
 
-        rule_result = get_rule_result(
-            self.rules,
-            self.module_name,
-            "INFO",
-            stack_level,
+        Args:
+            message: The log message
+            context: Additional structured data
+            trace_id: Optional trace ID for request tracking
+            exc_info: Include exception information
+            stack_info: Include stack trace
+            stacklevel: Override stack level for caller detection
+            **kwargs: Additional context fields
+
+        Returns:
+            Internal payload dict if rules are set, None otherwise
+        """
+        return self._log(
+            logging.INFO,
             message,
             context,
             trace_id,
+            exc_info,
+            stack_info,
+            stacklevel,
             _datanadhi_internal,
+            kwargs,
         )
-        if rule_result.stdout:
-            extra = get_extras(
-                context,
-                trace_id,
-                self.module_name,
-                _datanadhi_internal,
-                rule_result.payload,
-            )
-            self.logger.info(
-                message,
-                extra=extra,
-                stacklevel=stack_level,
-                exc_info=exc_info,
-                stack_info=stack_info,
-            )
-        self.trigger_pipelines(rule_result.payload, rule_result.pipelines)
-        return rule_result.payload
 
     def warning(
         self,
         message: str,
-        context: dict = {},
+        context: dict | None = None,
         trace_id: str | None = None,
         exc_info: bool = False,
         stack_info: bool = False,
@@ -304,55 +368,22 @@ class Logger:
         Returns:
             Internal payload dict if rules are set, None otherwise
         """
-        context, stack_level = get_context_stack_level(
-            self.config, context, stack_info, exc_info, stacklevel, kwargs
-        )
-
-        if self.no_rules_set or (_datanadhi_internal and self.can_log(logging.WARNING)):
-            extras = get_extras(
-                context, trace_id, self.module_name, _datanadhi_internal
-            )
-            self.logger.warning(
-                message,
-                extra=extras,
-                stacklevel=stack_level,
-                exc_info=exc_info,
-                stack_info=stack_info,
-            )
-            return None
-
-        rule_result = get_rule_result(
-            self.rules,
-            self.module_name,
-            "WARNING",
-            stack_level,
+        return self._log(
+            logging.WARNING,
             message,
             context,
             trace_id,
+            exc_info,
+            stack_info,
+            stacklevel,
             _datanadhi_internal,
+            kwargs,
         )
-        if rule_result.stdout:
-            extra = get_extras(
-                context,
-                trace_id,
-                self.module_name,
-                _datanadhi_internal,
-                rule_result.payload,
-            )
-            self.logger.warning(
-                message,
-                extra=extra,
-                stacklevel=stack_level,
-                exc_info=exc_info,
-                stack_info=stack_info,
-            )
-        self.trigger_pipelines(rule_result.payload, rule_result.pipelines)
-        return rule_result.payload
 
     def error(
         self,
         message: str,
-        context: dict = {},
+        context: dict | None = None,
         trace_id: str | None = None,
         exc_info: bool = False,
         stack_info: bool = False,
@@ -374,55 +405,22 @@ class Logger:
         Returns:
             Internal payload dict if rules are set, None otherwise
         """
-        context, stack_level = get_context_stack_level(
-            self.config, context, stack_info, exc_info, stacklevel, kwargs
-        )
-
-        if self.no_rules_set or (_datanadhi_internal and self.can_log(logging.ERROR)):
-            extras = get_extras(
-                context, trace_id, self.module_name, _datanadhi_internal
-            )
-            self.logger.error(
-                message,
-                extra=extras,
-                stacklevel=stack_level,
-                exc_info=exc_info,
-                stack_info=stack_info,
-            )
-            return None
-
-        rule_result = get_rule_result(
-            self.rules,
-            self.module_name,
-            "ERROR",
-            stack_level,
+        return self._log(
+            logging.ERROR,
             message,
             context,
             trace_id,
+            exc_info,
+            stack_info,
+            stacklevel,
             _datanadhi_internal,
+            kwargs,
         )
-        if rule_result.stdout:
-            extra = get_extras(
-                context,
-                trace_id,
-                self.module_name,
-                _datanadhi_internal,
-                rule_result.payload,
-            )
-            self.logger.error(
-                message,
-                extra=extra,
-                stacklevel=stack_level,
-                exc_info=exc_info,
-                stack_info=stack_info,
-            )
-        self.trigger_pipelines(rule_result.payload, rule_result.pipelines)
-        return rule_result.payload
 
     def critical(
         self,
         message: str,
-        context: dict = {},
+        context: dict | None = None,
         trace_id: str | None = None,
         exc_info: bool = False,
         stack_info: bool = False,
@@ -444,57 +442,22 @@ class Logger:
         Returns:
             Internal payload dict if rules are set, None otherwise
         """
-        context, stack_level = get_context_stack_level(
-            self.config, context, stack_info, exc_info, stacklevel, kwargs
-        )
-
-        if self.no_rules_set or (
-            _datanadhi_internal and self.can_log(logging.CRITICAL)
-        ):
-            extras = get_extras(
-                context, trace_id, self.module_name, _datanadhi_internal
-            )
-            self.logger.critical(
-                message,
-                extra=extras,
-                stacklevel=stack_level,
-                exc_info=exc_info,
-                stack_info=stack_info,
-            )
-            return None
-
-        rule_result = get_rule_result(
-            self.rules,
-            self.module_name,
-            "CRITICAL",
-            stack_level,
+        return self._log(
+            logging.CRITICAL,
             message,
             context,
             trace_id,
+            exc_info,
+            stack_info,
+            stacklevel,
             _datanadhi_internal,
+            kwargs,
         )
-        if rule_result.stdout:
-            extra = get_extras(
-                context,
-                trace_id,
-                self.module_name,
-                _datanadhi_internal,
-                rule_result.payload,
-            )
-            self.logger.critical(
-                message,
-                extra=extra,
-                stacklevel=stack_level,
-                exc_info=exc_info,
-                stack_info=stack_info,
-            )
-        self.trigger_pipelines(rule_result.payload, rule_result.pipelines)
-        return rule_result.payload
 
     def exception(
         self,
         message: str,
-        context: dict = {},
+        context: dict | None = None,
         trace_id: str | None = None,
         exc_info: bool = True,
         stack_info: bool = False,
@@ -519,24 +482,25 @@ class Logger:
         Returns:
             Internal payload dict if rules are set, None otherwise
         """
-        stack_level = (
-            stacklevel if stacklevel is not None else self.config.get("stack_level", 2)
-        )
-        return self.error(
-            message=message,
-            context=context,
-            trace_id=trace_id,
-            exc_info=exc_info,
-            stack_info=stack_info,
-            stacklevel=stack_level + 1,
-            _datanadhi_internal=_datanadhi_internal,
-            **kwargs,
+        return self._log(
+            logging.ERROR,
+            message,
+            context,
+            trace_id,
+            exc_info,
+            stack_info,
+            stacklevel,
+            _datanadhi_internal,
+            kwargs,
         )
 
     def wait_till_logs_pushed(self):
-        """Wait until all queued pipeline triggers are processed."""
+        """Wait until all queued pipeline triggers and log records are processed."""
         if self._processor:
             self._processor._wait_till_drain_complete()
+        for handler in self.logger.handlers:
+            if isinstance(handler, RecordQueueHandler):
+                handler.join()
 
     @staticmethod
     def get_record_defaults(record: logging.LogRecord) -> dict:
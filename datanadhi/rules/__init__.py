@@ -1,5 +1,18 @@
 from datanadhi.rules.config import ResolvedRules
 from datanadhi.rules.data_model import RuleActions, RuleEvaluationResult
-from datanadhi.rules.engine import evaluate_rules
+from datanadhi.rules.engine import (
+    RuleEvaluator,
+    compile_rules,
+    evaluate_rules,
+    rule_levels,
+)
 
-__all__ = ["ResolvedRules", "RuleActions", "RuleEvaluationResult", evaluate_rules]
+__all__ = [
+    "ResolvedRules",
+    "RuleActions",
+    "RuleEvaluationResult",
+    "RuleEvaluator",
+    "compile_rules",
+    "rule_levels",
+    evaluate_rules,
+]
@@ -1,4 +1,4 @@
-import glob
+import functools
 import os
 from pathlib import Path
 
@@ -13,6 +13,12 @@ from datanadhi.rules.data_model import (
 from datanadhi.utils.files import load_from_yaml, read_from_json, write_to_json
 
 
+@functools.lru_cache(maxsize=16)
+def _read_resolved(path: str, mtime_ns: int) -> RuleActions:
+    """Read resolved rules; mtime_ns in the key invalidates on edits."""
+    return RuleActions(read_from_json(path))
+
+
 class ResolvedRules:
     """Load and resolve rules from YAML files."""
     
@@ -104,8 +110,16 @@ class ResolvedRules:
 
     def build_rules_from_files(self):
         """Load all rule files and build resolved rules."""
-        paths = glob.glob(f"{self.datanadhi_dir}/rules/*.yaml")
-        paths += glob.glob(f"{self.datanadhi_dir}/rules/*.yml")
+        # One directory pass for both extensions, in a stable order
+        try:
+            with os.scandir(Path(self.datanadhi_dir) / "rules") as entries:
+                paths = sorted(
+                    entry.path
+                    for entry in entries
+                    if entry.name.endswith((".yaml", ".yml")) and entry.is_file()
+                )
+        except (FileNotFoundError, NotADirectoryError):
+            paths = []
 
         for path in paths:
             self.get_rules_from_file(path)
@@ -116,6 +130,8 @@ class ResolvedRules:
 
     def get(self):
         """Get resolved rules, loading from cache or building."""
-        if os.path.exists(self.path):
-            return RuleActions(read_from_json(self.path))
-        return RuleActions(self.build_rules_from_files())
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return RuleActions(self.build_rules_from_files())
+        return _read_resolved(str(self.path), mtime_ns)
@@ -1,17 +1,55 @@
 import contextvars
-import datetime
 import os
+import random
 import sys
-import uuid
+import threading
 
+from datanadhi.logger.context import STACK_LEVEL_OFFSET
 from datanadhi.rules import (
-    RuleActions,
     RuleEvaluationResult,
-    evaluate_rules,
+    RuleEvaluator,
 )
+from datanadhi.utils.general import utc_iso_timestamp
 
-STACK_LEVEL_OFFSET = 2
 trace_id_var = contextvars.ContextVar("trace_id", default=None)
+# Bound once, as every log call reads (and may set) the trace ID
+_get_current_trace_id = trace_id_var.get
+_set_current_trace_id = trace_id_var.set
+
+# {id(code): (code, abspath, function name, module name)}; holding the code
+# object keeps its id from being reused while the entry exists
+_CODE_CACHE: dict[int, tuple] = {}
+_CODE_CACHE_MAX = 4096
+
+
+# Per-thread PRNG for trace IDs, seeded from os.urandom; reset in forked
+# children so they do not repeat the parent's sequence
+_trace_rng = threading.local()
+
+
+def _reset_trace_rng():
+    global _trace_rng
+    _trace_rng = threading.local()
+
+
+os.register_at_fork(after_in_child=_reset_trace_rng)
+
+# Masks setting the UUID version 4 and RFC 4122 variant bits
+_UUID4_CLEAR = ~((0xF000 << 64) | (0xC000 << 48))
+_UUID4_SET = (4 << 76) | (0x8000 << 48)
+
+
+def _new_trace_id() -> str:
+    """Random UUID4-formatted trace ID.
+
+    Trace IDs only need to be unique, not unpredictable, so this skips the
+    getrandom() syscall and UUID object uuid.uuid4() costs per call.
+    """
+    rng = getattr(_trace_rng, "rng", None)
+    if rng is None:
+        rng = _trace_rng.rng = random.Random(os.urandom(16))
+    h = "%032x" % (rng.getrandbits(128) & _UUID4_CLEAR | _UUID4_SET)
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
 
 
 def _get_internal_trace_id(module_name: str) -> str:
@@ -24,10 +62,13 @@ def _get_trace_id(
     if _is_datanadhi_internal:
         return _get_internal_trace_id(module_name)
     if trace_id is not None:
-        trace_id_var.set(trace_id)
-    if trace_id_var.get() is None:
-        trace_id_var.set(str(uuid.uuid4()))
-    return trace_id_var.get()
+        _set_current_trace_id(trace_id)
+        return trace_id
+    current = _get_current_trace_id()
+    if current is None:
+        current = _new_trace_id()
+        _set_current_trace_id(current)
+    return current
 
 
 def _get_caller_info(skip_stack: int) -> tuple[str, int, str, str]:
@@ -48,11 +89,19 @@ def _get_caller_info(skip_stack: int) -> tuple[str, int, str, str]:
         - module_name (str): Name of the module containing the call
     """
     frame = sys._getframe(skip_stack)
-    filename = os.path.abspath(frame.f_code.co_filename)
-    lineno = frame.f_lineno
-    function_name = frame.f_code.co_name
-    module_name = frame.f_globals.get("__name__")
-    return filename, lineno, function_name, module_name
+    code = frame.f_code
+    entry = _CODE_CACHE.get(id(code))
+    if entry is None or entry[0] is not code:
+        if len(_CODE_CACHE) >= _CODE_CACHE_MAX:
+            _CODE_CACHE.clear()
+        entry = (
+            code,
+            os.path.abspath(code.co_filename),
+            code.co_name,
+            frame.f_globals.get("__name__"),
+        )
+        _CODE_CACHE[id(code)] = entry
+    return entry[1], frame.f_lineno, entry[2], entry[3]
 
 
 def _build_internal_payload(
@@ -60,7 +109,7 @@ def _build_internal_payload(
     stacklevel: int,
     message: str,
     given_module_name: str = "",
-    context: dict = {},
+    context: dict | None = None,
 ) -> dict:
     """Build a structured log payload with metadata.
 
@@ -82,11 +131,11 @@ def _build_internal_payload(
     """
     skip_stack = stacklevel + STACK_LEVEL_OFFSET
     filename, lineno, function_name, module_name = _get_caller_info(skip_stack)
-    timestamp = datetime.datetime.now(datetime.UTC).isoformat() + "Z"
+    timestamp = utc_iso_timestamp()
 
     return {
         "message": message,
-        "trace_id": trace_id_var.get(),
+        "trace_id": _get_current_trace_id(),
         "timestamp": timestamp,
         "module_name": given_module_name,
         "log_record": {
@@ -96,17 +145,17 @@ def _build_internal_payload(
             "line_number": lineno,
             "module_name": module_name,
         },
-        "context": context,
+        "context": context if context is not None else {},
     }
 
 
 def get_rule_result(
-    rules: RuleActions,
+    evaluate: RuleEvaluator,
     module_name: str,
     level: str,
     stacklevel: int,
     message: str,
-    context: dict = {},
+    context: dict | None = None,
     trace_id: str | None = None,
     _is_datanadhi_internal: bool = False,
 ) -> RuleEvaluationResult:
@@ -133,20 +182,24 @@ def get_rule_result(
     """
     _get_trace_id(trace_id, module_name, _is_datanadhi_internal)
     payload = _build_internal_payload(level, stacklevel, message, module_name, context)
-    pipelines, stdout_flag = evaluate_rules(payload, rules)
+    pipelines, stdout_flag = evaluate(payload)
     return RuleEvaluationResult(
         pipelines=pipelines, stdout=stdout_flag, payload=payload
     )
 
 
 def get_extras(
-    context, trace_id, module_name=None, _is_datanadhi_internal=False, payload={}
+    context, trace_id, module_name=None, _is_datanadhi_internal=False, payload=None
 ):
-    timestamp = datetime.datetime.now(datetime.UTC).isoformat() + "Z"
+    if payload:
+        # Rules payloads already carry the record's timestamp and trace ID
+        return {
+            "timestamp": payload["timestamp"],
+            "context": context,
+            "trace_id": payload["trace_id"],
+        }
     return {
-        "timestamp": payload.get("timestamp", timestamp),
+        "timestamp": utc_iso_timestamp(),
         "context": context,
-        "trace_id": payload.get(
-            "trace_id", _get_trace_id(trace_id, module_name, _is_datanadhi_internal)
-        ),
+        "trace_id": _get_trace_id(trace_id, module_name, _is_datanadhi_internal),
     }
@@ -5,10 +5,25 @@ and determining which pipelines to trigger and whether to output to stdout.
 """
 
 import re
+import sys
+from collections.abc import Callable
 from typing import Any
 
 from datanadhi.rules.data_model import Condition, ConditionType, RuleActions
 
+try:
+    # Optional linear-time engine: pip install datanadhi-log[re2]
+    import re2
+except ImportError:
+    re2 = None
+
+RuleEvaluator = Callable[[dict], tuple[list[str], bool]]
+
+LEVEL_KEY = "log_record.level"
+
+# Marks a key not yet resolved in the per-evaluation value cache
+_UNRESOLVED = object()
+
 
 def get_nested_value(data: dict, key_path: str) -> Any:
     """Safely retrieve a nested value from a dictionary using dot notation.
@@ -104,3 +119,183 @@ def evaluate_rules(
     except Exception:
         # Silently return empty on evaluation error
         return [], False
+
+
+def _compile_regex(pattern: str):
+    """Compile pattern with re2 when installed, else (or if re2 rejects it) re.
+
+    re2 matches in linear time but lacks backreferences and lookaround, so
+    such patterns keep using re.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(pattern)
+        except Exception:
+            pass
+    return re.compile(pattern)
+
+
+def _compile_condition(condition: Condition) -> Callable[[dict, dict], bool]:
+    """Compile a condition into a check with pre-split keys and compiled regex.
+
+    Behaves like get_nested_value followed by match_condition. Resolved values
+    are shared through the evaluation's cache, so each distinct key is looked
+    up once per payload however many conditions test it.
+    """
+    key = sys.intern(condition.key)
+    keys = tuple(key.split("."))
+    cond_val = condition.value
+    negate = bool(condition.negate)
+
+    if condition.type == ConditionType.EXACT:
+
+        def test(value):
+            return value == cond_val
+
+    elif condition.type == ConditionType.PARTIAL:
+
+        def test(value):
+            return cond_val in str(value)
+
+    elif condition.type == ConditionType.REGEX:
+        try:
+            match = _compile_regex(cond_val).match
+        except re.error as e:
+            # Fail at evaluation time, like the uncompiled re.match would
+            error = e
+
+            def test(value):
+                raise error
+
+        else:
+
+            def test(value):
+                return match(str(value)) is not None
+
+    else:
+
+        def test(value):
+            return False
+
+    def check(data: dict, resolved: dict) -> bool:
+        value = resolved.get(key, _UNRESOLVED)
+        if value is _UNRESOLVED:
+            value = data
+            for k in keys:
+                value = value.get(k) if isinstance(value, dict) else None
+                if value is None:
+                    break
+            resolved[key] = value
+        if value is None:
+            return False
+        return test(value) != negate
+
+    return check
+
+
+def _compile_rule(
+    any_condition_match: bool, conditions
+) -> Callable[[dict, dict], bool]:
+    """Compile a rule into a check that short-circuits like evaluate_rules."""
+    checks = tuple(_compile_condition(condition) for condition in conditions)
+
+    if any_condition_match:
+
+        def rule_matches(data: dict, resolved: dict) -> bool:
+            for check in checks:
+                if check(data, resolved):
+                    return True
+            return False
+
+    else:
+
+        def rule_matches(data: dict, resolved: dict) -> bool:
+            for check in checks:
+                if not check(data, resolved):
+                    return False
+            return True
+
+    return rule_matches
+
+
+def compile_rules(rule_actions: RuleActions | None = None) -> RuleEvaluator:
+    """Compile rules once into an evaluator with the same results as evaluate_rules.
+
+    Keys are pre-split and regexes pre-compiled, and each action stops at its
+    first matching rule since further matches cannot change its effect. Once
+    every pipeline and stdout are set, remaining actions are skipped too.
+    """
+    compiled = tuple(
+        (
+            frozenset(action.pipelines),
+            action.stdout,
+            tuple(
+                _compile_rule(rule.any_condition_match, rule.conditions)
+                for rule in rules
+            ),
+        )
+        for action, rules in (rule_actions or ())
+    )
+    pipeline_count = len(frozenset().union(*(entry[0] for entry in compiled)))
+    any_stdout = any(entry[1] for entry in compiled)
+
+    def evaluate(log_dict: dict) -> tuple[list[str], bool]:
+        try:
+            pipelines_to_trigger = set()
+            stdout_flag = False
+            resolved = {}
+            for pipelines, stdout, rule_checks in compiled:
+                for rule_matches in rule_checks:
+                    if rule_matches(log_dict, resolved):
+                        pipelines_to_trigger.update(pipelines)
+                        stdout_flag = stdout_flag or stdout
+                        break
+                else:
+                    continue
+                if len(pipelines_to_trigger) == pipeline_count and (
+                    stdout_flag or not any_stdout
+                ):
+                    # Later actions have nothing left to add
+                    break
+            return list(pipelines_to_trigger), stdout_flag
+        except Exception:
+            # Silently return empty on evaluation error
+            return [], False
+
+    return evaluate
+
+
+def _rule_levels(rule) -> set[str] | None:
+    """Levels a rule can match, or None if it is not restricted by level."""
+    levels = [
+        c.value
+        for c in rule.conditions
+        if c.key == LEVEL_KEY and c.type == ConditionType.EXACT and not c.negate
+    ]
+    if rule.any_condition_match:
+        if not rule.conditions:
+            return set()
+        if len(levels) == len(rule.conditions):
+            return set(levels)
+        return None
+    if not levels:
+        return None
+    # Every exact level condition must hold; differing ones never match
+    return set(levels) if len(set(levels)) == 1 else set()
+
+
+def rule_levels(rule_actions: RuleActions | None = None) -> frozenset[str] | None:
+    """Levels any rule with an effect can match, or None if any level can match.
+
+    Only exact, non-negated conditions on log_record.level narrow the result.
+    """
+    levels = set()
+    for action, rules in rule_actions or ():
+        if not action.pipelines and not action.stdout:
+            continue
+        for rule in rules:
+            matched = _rule_levels(rule)
+            if matched is None:
+                return None
+            levels |= matched
+    return frozenset(levels)
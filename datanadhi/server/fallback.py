@@ -1,29 +1,44 @@
 """Fallback server communication with compressed batch uploads."""
 
 import gzip
-import io
-import json
 
+import orjson
 import requests
 
+# Log JSONL compresses about as well at low levels as at gzip's default 9,
+# for a fraction of the CPU
+GZIP_COMPRESS_LEVEL = 3
 
-def _encode_jsonl_gz(dicts: list[dict]) -> bytes:
-    """Encode list of dicts as gzipped JSONL bytes."""
-    buf = io.BytesIO()
-    with gzip.GzipFile(fileobj=buf, mode="w") as gz:
-        for obj in dicts:
-            line = json.dumps(obj).encode("utf-8") + b"\n"
-            gz.write(line)
-    return buf.getvalue()
+
+def _encode_jsonl_gz(items: list[tuple]) -> bytes:
+    """Encode (pipelines, payload) items as gzipped JSONL bytes."""
+    body = b"".join(
+        orjson.dumps(
+            {"pipelines": pipelines, "log_data": payload},
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+        )
+        for pipelines, payload in items
+    )
+    # One-shot compress; mtime=0 keeps identical batches byte-identical
+    return gzip.compress(body, compresslevel=GZIP_COMPRESS_LEVEL, mtime=0)
 
 
 def send(
-    session: requests.Session, server_host: str, payloads: list[dict], api_key: str
+    session: requests.Session, server_host: str, items: list[tuple], api_key: str
 ) -> dict:
-    """Send batch of logs to fallback server as gzipped JSONL."""
+    """Send batch of (pipelines, payload) items to fallback as gzipped JSONL."""
     try:
-        compressed_data = _encode_jsonl_gz(payloads)
+        compressed_data = _encode_jsonl_gz(items)
+    except TypeError:
+        # Unencodable payload (JSONEncodeError), retrying cannot help
+        return {
+            "success": False,
+            "status_code": None,
+            "is_failure": True,
+            "is_unavailable": False,
+        }
 
+    try:
         response = session.post(
             f"{server_host}/upload",
             data=compressed_data,
@@ -1,12 +1,13 @@
 """Primary server communication."""
 
+import orjson
 import requests
 
 
-def is_healthy(session: requests.Session, server_host: str) -> bool:
+def is_healthy(session: requests.Session, server_host: str, timeout: float = 2) -> bool:
     """Check if primary server responds with 2xx status."""
     try:
-        response = session.get(f"{server_host}/", timeout=2)
+        response = session.get(f"{server_host}/", timeout=timeout)
         return 200 <= response.status_code < 300
     except requests.RequestException:
         return False
@@ -16,11 +17,25 @@ def send(
     session: requests.Session, server_host: str, payload: dict, api_key: str
 ) -> dict:
     """Send log to primary server. Returns status dict."""
+    try:
+        body = orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        # Unencodable payload (JSONEncodeError), retrying cannot help
+        return {
+            "success": False,
+            "status_code": None,
+            "is_failure": True,
+            "is_unavailable": False,
+        }
+
     try:
         response = session.post(
             f"{server_host}/log",
-            json=payload,
-            headers={"DATANADHI_API_KEY": api_key},
+            data=body,
+            headers={
+                "Content-Type": "application/json",
+                "DATANADHI_API_KEY": api_key,
+            },
             timeout=10,
         )
 
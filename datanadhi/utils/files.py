@@ -1,21 +1,43 @@
+import json
+import os
+import tempfile
 import time
 from pathlib import Path
 
 import orjson
 import yaml
 
+try:
+    # libyaml-backed loader, several times faster than the pure-Python one
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 
 def load_from_yaml(path: Path):
     """Load YAML file and return parsed content."""
     with open(path) as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_SafeLoader)
 
 
 def write_to_json(path: Path, data: dict):
-    """Write data to JSON file using orjson."""
-    with open(path, "wb") as f:
-        blob = orjson.dumps(data)
-        f.write(blob)
+    """Write data to JSON file using orjson.
+
+    Written to a temp file and renamed into place, so concurrent readers
+    (e.g. pre-forked workers building the same cache) never see a partial file.
+    """
+    path = Path(path)
+    # Unique per call: threads of one process may build the same file at once
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.tmp.")
+    tmp_path = Path(tmp_name)
+    try:
+        with open(fd, "wb") as f:
+            os.fchmod(fd, 0o644)  # mkstemp creates 0600; keep the usual mode
+            f.write(orjson.dumps(data))
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
 
 
 def read_from_json(path: Path):
@@ -24,6 +46,18 @@ def read_from_json(path: Path):
         return orjson.loads(f.read())
 
 
+def _dumps_dropped_line(pipelines: list, payload: dict) -> bytes:
+    """Encode one dropped item as a JSONL line, stringifying what orjson rejects."""
+    record = {"pipelines": pipelines, "log_data": payload}
+    try:
+        return orjson.dumps(
+            record, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        )
+    except TypeError:
+        # Dropped data must persist even when the send failed to encode it
+        return (json.dumps(record, default=str) + "\n").encode()
+
+
 def store_dropped_data(datanadhi_dir: Path, items: list, reason: str) -> str:
     """Store dropped data to file and return file path.
 
@@ -42,12 +76,13 @@ def store_dropped_data(datanadhi_dir: Path, items: list, reason: str) -> str:
     filename = f"{reason}_{timestamp}.jsonl"
     file_path = dropped_dir / filename
 
-    # Write as JSONL
+    # Write as JSONL in one go
     with open(file_path, "wb") as f:
-        for item in items:
-            pipelines, payload = item
-            record = {"pipelines": pipelines, "log_data": payload}
-            f.write(orjson.dumps(record) + b"\n")
+        f.write(
+            b"".join(
+                _dumps_dropped_line(pipelines, payload) for pipelines, payload in items
+            )
+        )
 
     # Return relative path
     return str(file_path.relative_to(datanadhi_dir))
@@ -1,9 +1,22 @@
-from pathlib import Path
+import time
 
-import yaml
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last formatted timestamp
+_second_prefix = (-1, "")
 
 
-def load_from_yaml(path: Path):
-    """Load YAML file and return parsed content."""
-    with open(path) as f:
-        return yaml.safe_load(f)
+def utc_iso_timestamp(created: float | None = None) -> str:
+    """Format an epoch time (default: now) as UTC ISO 8601 with a "Z" suffix.
+
+    The date/time prefix is reused within a second, so bursts of records only
+    format the microseconds.
+    """
+    global _second_prefix
+    if created is None:
+        created = time.time()
+    second = int(created)
+    cached_second, prefix = _second_prefix
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _second_prefix = (second, prefix)
+    micro = int((created - second) * 1_000_000)
+    return f"{prefix}.{micro:06d}+00:00Z"
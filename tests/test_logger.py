@@ -0,0 +1,67 @@
+import contextvars
+import gc
+import logging
+
+import pytest
+
+from datanadhi import Logger
+from datanadhi.rules.core import trace_id_var
+
+
+@pytest.fixture
+def make_logger(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATANADHI_API_KEY", "test-key")
+    (tmp_path / ".datanadhi").mkdir()
+
+    def make(module_name="test", **kwargs):
+        return Logger(
+            module_name,
+            datanadhi_dir=tmp_path / ".datanadhi",
+            echopost_disable=True,
+            **kwargs,
+        )
+
+    return make
+
+
+def test_disabled_level_still_binds_trace_id(make_logger):
+    logger = make_logger(log_level="INFO")
+
+    def run():
+        logger.debug("skipped", trace_id="REQ-123")
+        return trace_id_var.get()
+
+    assert contextvars.copy_context().run(run) == "REQ-123"
+
+
+def test_stdlib_logger_follows_disable_and_set_level(make_logger):
+    logger = make_logger(log_level="INFO")
+    std_logger = logger.logger
+    assert std_logger.isEnabledFor(logging.INFO)  # fills the level cache
+
+    logging.disable(logging.CRITICAL)
+    try:
+        assert not std_logger.isEnabledFor(logging.INFO)
+    finally:
+        logging.disable(logging.NOTSET)
+    assert std_logger.isEnabledFor(logging.INFO)
+
+    std_logger.setLevel(logging.WARNING)
+    assert not std_logger.isEnabledFor(logging.INFO)
+
+
+def test_registry_entry_released_with_owner(make_logger):
+    logger = make_logger()
+    name = logger.logger.name
+    assert name in logging.Logger.manager.loggerDict
+
+    del logger
+    gc.collect()
+    assert name not in logging.Logger.manager.loggerDict
+
+
+def test_dotted_module_name_creates_no_placeholders(make_logger):
+    before = set(logging.Logger.manager.loggerDict)
+    logger = make_logger(module_name="app.db")
+    assert set(logging.Logger.manager.loggerDict) - before == {logger.logger.name}
+    assert logger.logger.parent is logging.getLogger()
@@ -0,0 +1,166 @@
+import threading
+
+import pytest
+
+from datanadhi.async_processing.queue import (
+    SENTINEL,
+    WRITEBACK_BUFFER_FACTOR,
+    SafeQueue,
+    ShardedQueue,
+)
+
+
+def test_add_get_task_done_join():
+    q = SafeQueue(maxsize=3)
+    assert q.add(("p", 1))
+    assert q.add(("p", 2))
+    assert q.add(("p", 3))
+    assert not q.add(("p", 4))  # full
+    assert q.unfinished_tasks == 3
+
+    assert q.get(timeout=0) == ("p", 1)
+    assert q.get_batch(5) == [("p", 2), ("p", 3)]
+    assert q.get(timeout=0) is None
+
+    q.task_done()
+    q.task_done_n(2)
+    assert q.unfinished_tasks == 0
+    q.join()  # returns immediately once all tasks are done
+
+
+def test_task_done_n_too_many_raises():
+    q = SafeQueue(maxsize=2)
+    q.add(("p", 1))
+    with pytest.raises(ValueError):
+        q.task_done_n(2)
+
+
+def test_join_waits_for_task_done():
+    q = SafeQueue(maxsize=2)
+    q.add(("p", 1))
+    q.get(timeout=0)
+    done = threading.Event()
+
+    def joiner():
+        q.join()
+        done.set()
+
+    t = threading.Thread(target=joiner)
+    t.start()
+    assert not done.wait(0.05)
+    q.task_done()
+    assert done.wait(1)
+    t.join()
+
+
+def test_join_timeout_returns_false_while_tasks_pending():
+    q = SafeQueue(maxsize=2)
+    q.add(("p", 1))
+    assert not q.join(timeout=0.01)
+    q.get(timeout=0)
+    q.task_done()
+    assert q.join(timeout=0)
+
+
+def test_sharded_join_timeout():
+    q = ShardedQueue(maxsize=4, shard_count=2)
+    q.add(("p", 1))
+    assert not q.join(timeout=0.01)
+    q.get(timeout=0)
+    q.task_done_n(1)
+    assert q.join(timeout=0)
+
+
+def test_writeback_many_keeps_order_at_front():
+    q = SafeQueue(maxsize=5)
+    q.add(("p", 3))
+    q.writeback_many([("p", 1), ("p", 2)])
+    assert q.get_batch(5) == [("p", 1), ("p", 2), ("p", 3)]
+
+
+def test_writeback_overflow_goes_ahead_of_buffered_items():
+    q = SafeQueue(maxsize=1)
+    q.add(("p", "filler"))  # queue full, so writebacks land in the buffer
+    q.writeback_one(("p", "newer"))
+    q.writeback_many([("p", "older1"), ("p", "older2")])
+    q.writeback_one(("p", "oldest"))
+    assert q._writeback_buffer == [
+        ("p", "oldest"),
+        ("p", "older1"),
+        ("p", "older2"),
+        ("p", "newer"),
+    ]
+
+
+def test_writeback_overflow_evicts_oldest():
+    evicted = []
+    q = SafeQueue(maxsize=1, on_evict=evicted.extend)
+    items = [("p", i) for i in range(WRITEBACK_BUFFER_FACTOR + 3)]
+    for item in items:
+        q.add(item)
+        q.get_batch(1)  # taken by a worker, still an unfinished task
+    assert q.unfinished_tasks == len(items)
+
+    # One item fits back in the queue, the rest overflow the buffer
+    q.writeback_many(items)
+    assert q.get(timeout=0) == items[0]
+    assert evicted == items[1:3]
+    assert q.evicted_count == 2
+    assert q.unfinished_tasks == len(items) - 2
+
+
+def test_close_returns_sentinel_once_drained():
+    q = SafeQueue(maxsize=2)
+    q.add(("p", 1))
+    q.close()
+    assert q.get(timeout=1) == ("p", 1)
+    assert q.get(timeout=1) is SENTINEL
+
+
+def test_close_wakes_blocked_consumer():
+    q = SafeQueue(maxsize=2)
+    result = []
+    t = threading.Thread(target=lambda: result.append(q.get(timeout=5)))
+    t.start()
+    q.close()
+    t.join(2)
+    assert result == [SENTINEL]
+
+
+def test_sharded_task_done_after_steal_hits_source_shard():
+    q = ShardedQueue(maxsize=4, shard_count=2)
+    q.add(("p", 1))  # round-robin: lands on shard 0
+    source, home = q._shards
+    assert source.unfinished_tasks == 1
+
+    result = []
+
+    def worker():
+        q.bind_shard(1)  # home shard is empty, so get() steals
+        result.append(q.get(timeout=0))
+        q.task_done_n(1)
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    assert result == [("p", 1)]
+    assert source.unfinished_tasks == 0
+    assert home.unfinished_tasks == 0
+    q.join()
+
+
+def test_sharded_writeback_returns_to_source_shard():
+    q = ShardedQueue(maxsize=4, shard_count=2)
+    q.add(("p", 1))
+    source = q._shards[0]
+
+    def worker():
+        q.bind_shard(1)
+        item = q.get(timeout=0)
+        q.writeback_many([item])
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    assert source.qsize() == 1
+    assert q._shards[1].qsize() == 0